@@ -1,7 +1,10 @@
 """
 config.py — Central configuration and data-source registry for Virtual Me.
 """
+import fnmatch
 import os
+import re
+from dataclasses import dataclass
 from pathlib import Path
 
 # ── ChromaDB ──────────────────────────────────
@@ -9,6 +12,9 @@ CHROMA_PATH       = "./.chroma_data"
 COLLECTION_NAME   = "virtual_me_knowledge"
 EPISODIC_NAME     = "episodic_memory"
 NAME_MAPPING_FILE = "./conversation_names.json"
+# Documents per collection.upsert() during ingest; clamped to the range the
+# Ingest page's batch-size input accepts.
+DEFAULT_INGEST_BATCH = max(4, min(5000, int(os.environ.get("INGEST_BATCH_SIZE", 250))))
 
 # ── Data folder ───────────────────────────────
 DATA_DIR = Path("./data")
@@ -23,6 +29,16 @@ DEFAULT_DELIBERATION_ROUNDS = 2
 DEFAULT_ACTIVE_PERSONAS = ["The Inner Critics", "The Inner Child", "The Rebel", "The People Pleaser"]
 DEFAULT_ENABLE_THINKING = True
 DEFAULT_NUM_PREDICT = 1024
+# How long Ollama keeps a model (and its KV cache for the shared system-prompt
+# prefix) resident after a request. Ollama's own default is 5 minutes.
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+
+# ── LLM backend ───────────────────────────────
+# "ollama" (default) or "vllm" (any OpenAI-compatible /v1 endpoint). Setting
+# VLLM_URL alone switches the default to vLLM. With vLLM, the chat model name
+# must be the served model id (e.g. "Qwen/Qwen2.5-7B-Instruct").
+VLLM_URL    = os.environ.get("VLLM_URL", "http://localhost:8000/v1")
+LLM_BACKEND = os.environ.get("LLM_BACKEND", "vllm" if "VLLM_URL" in os.environ else "ollama")
 
 IDENTITIES = {
     "The Self": (
@@ -78,6 +94,10 @@ DEFAULT_SYSTEM_PROMPT = IDENTITIES["The Self"]
 # NOTE: Changing this requires re-ingesting all ChromaDB collections.
 EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "BAAI/bge-m3")
 
+# Opt-in int8 dynamic quantization of the embedding encoder on CPU
+# (see rag/embeddings.py). Off by default until recall is validated.
+EMBEDDING_INT8 = os.environ.get("EMBEDDING_INT8", "0") == "1"
+
 # Popular multilingual / English embedding models (shown in Settings picker).
 EMBEDDING_MODELS = [
     "BAAI/bge-m3",
@@ -97,6 +117,7 @@ EMBEDDING_MODELS = [
 NEO4J_URI      = os.environ.get("NEO4J_URI",      "bolt://localhost:7687")
 NEO4J_USER     = os.environ.get("NEO4J_USER",     "neo4j")
 NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", "password")
+NEO4J_DATABASE = os.environ.get("NEO4J_DATABASE", "neo4j")
 
 # ── Knowledge graph self-identity ─────────────
 # The name used to anchor "you" in the graph (most-frequent sender auto-detected
@@ -104,51 +125,80 @@ NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", "password")
 SELF_NAME      = "ME"
 
 # ── Known data sources ────────────────────────
-SOURCES = [
-    {
-        "id":            "facebook",
-        "label":         "Facebook Messages",
-        "icon":          "chat",
-        "color":         "#4267B2",
-        "chroma_source": "facebook_windowed",
-        "data_folder":   "facebook",
-        "file_patterns": ["*.json"],
-        "stat_label":    "documents",
-        "description":   "Chat history ingested from Facebook Messenger export",
-    },
-    {
-        "id":            "google",
-        "label":         "Google Locations",
-        "icon":          "map",
-        "color":         "#34A853",
-        "chroma_source": "google_locations",
-        "data_folder":   "google",
-        "file_patterns": ["Records.json", "*.json"],
-        "stat_label":    "locations",
-        "description":   "Location history from Google Takeout",
-    },
-    {
-        "id":            "spotify",
-        "label":         "Spotify Sessions",
-        "icon":          "music_note",
-        "color":         "#1DB954",
-        "chroma_source": "spotify",
-        "data_folder":   "spotify",
-        "file_patterns": ["Streaming_History_Audio_*.json"],
-        "stat_label":    "sessions",
-        "graph_label":   "Song",
-        "description":   "Extended streaming history from Spotify privacy request",
-    },
-    {
-        "id":            "steam",
-        "label":         "Steam Gaming",
-        "icon":          "sports_esports",
-        "color":         "#1b2838",
-        "chroma_source": "steam",
-        "data_folder":   "steam",
-        "file_patterns": ["*.csv"],
-        "stat_label":    "sessions",
-        "graph_label":   "Game",
-        "description":   "Play-session history from Steam",
-    },
-]
+@dataclass(frozen=True, slots=True)
+class SourceSpec:
+    """One entry of the data-source registry (drives ingestion, stats, graph)."""
+    id:            str
+    label:         str
+    icon:          str
+    color:         str
+    chroma_source: str
+    data_folder:   str
+    file_patterns: tuple[str, ...]
+    stat_label:    str
+    description:   str
+    graph_label:   str | None = None
+
+
+SOURCES: tuple[SourceSpec, ...] = (
+    SourceSpec(
+        id            = "facebook",
+        label         = "Facebook Messages",
+        icon          = "chat",
+        color         = "#4267B2",
+        chroma_source = "facebook_windowed",
+        data_folder   = "facebook",
+        file_patterns = ("*.json",),
+        stat_label    = "documents",
+        description   = "Chat history ingested from Facebook Messenger export",
+    ),
+    SourceSpec(
+        id            = "google",
+        label         = "Google Locations",
+        icon          = "map",
+        color         = "#34A853",
+        chroma_source = "google_locations",
+        data_folder   = "google",
+        file_patterns = ("Records.json", "*.json"),
+        stat_label    = "locations",
+        description   = "Location history from Google Takeout",
+    ),
+    SourceSpec(
+        id            = "spotify",
+        label         = "Spotify Sessions",
+        icon          = "music_note",
+        color         = "#1DB954",
+        chroma_source = "spotify",
+        data_folder   = "spotify",
+        file_patterns = ("Streaming_History_Audio_*.json",),
+        stat_label    = "sessions",
+        graph_label   = "Song",
+        description   = "Extended streaming history from Spotify privacy request",
+    ),
+    SourceSpec(
+        id            = "steam",
+        label         = "Steam Gaming",
+        icon          = "sports_esports",
+        color         = "#1b2838",
+        chroma_source = "steam",
+        data_folder   = "steam",
+        file_patterns = ("*.csv",),
+        stat_label    = "sessions",
+        graph_label   = "Game",
+        description   = "Play-session history from Steam",
+    ),
+)
+
+SOURCES_BY_ID            = {s.id: s for s in SOURCES}
+SOURCES_BY_CHROMA_SOURCE = {s.chroma_source: s for s in SOURCES}
+
+# File patterns compiled once so data-folder scans don't re-translate globs.
+SOURCE_PATTERNS: dict[str, tuple[re.Pattern, ...]] = {
+    s.id: tuple(re.compile(fnmatch.translate(p)) for p in s.file_patterns)
+    for s in SOURCES
+}
+
+
+def matches_source(path: str, source_id: str) -> bool:
+    """True if the file name *path* matches any file pattern of *source_id*."""
+    return any(p.match(path) for p in SOURCE_PATTERNS[source_id])
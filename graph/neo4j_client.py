@@ -4,26 +4,213 @@ graph/neo4j_client.py — Neo4j driver, schema constraints, and MERGE helpers.
 Designed to be imported by extractor scripts and the Streamlit UI alike.
 All writes use MERGE so re-running extractors is safe (idempotent).
 """
+import functools
+import re
 import sys
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from itertools import chain
 
 from neo4j import GraphDatabase, exceptions as neo4j_exc
 
 from graph.constants import ENTITY_LABELS, REL_TYPES  # noqa: F401 — re-exported
 
+# Full-text index over every entity's name, used by search_nodes()
+_NAME_FULLTEXT_INDEX = "entity_name_ft"
+# Lucene query-syntax characters that must be backslash-escaped in user input
+_LUCENE_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _canon_name(name: str) -> str:
+    """
+    The ``name`` key every write helper MERGEs on, and every read helper
+    looks up: NFKC-normalised and stripped, so visually identical spellings
+    (full-width letters, ligatures, stray whitespace) land on one node.
+    Cached because bulk rows repeat the same few endpoints (typically the
+    self node) thousands of times.
+
+    Nodes written before names were canonicalised keep their raw spelling,
+    so these helpers no longer find them and a re-ingest creates a
+    canonical twin.  Migrate once: list them (Neo4j 5.17+ has normalize())
+    with ``MATCH (n) WHERE n.name <> trim(normalize(n.name, NFKC))
+    RETURN labels(n), n.name``, then rename each one or merge it into its
+    twin (``apoc.refactor.mergeNodes``), or wipe the graph and re-run the
+    extractors.
+    """
+    return unicodedata.normalize("NFKC", name).strip()
+
+
+def _in_transactions(unwind: str, body: str, concurrent: bool) -> str:
+    """``UNWIND … body``, or with *concurrent* the same body run server-side in
+    parallel batches of $batch rows (``CALL { } IN CONCURRENT TRANSACTIONS``,
+    auto-commit only)."""
+    if concurrent:
+        var = unwind.rsplit(" AS ", 1)[1]
+        return f"{unwind} CALL ({var}) {{ {body} }} IN CONCURRENT TRANSACTIONS OF $batch ROWS"
+    return f"{unwind} {body}"
+
+
+def _merge_nodes_query(label: str, concurrent: bool = False) -> str:
+    """UNWIND query MERGEing one `label` node per name in $rows."""
+    return _in_transactions("UNWIND $rows AS name", f"MERGE (:{label} {{name: name}})", concurrent)
+
+
+def _merge_relations_query(from_label: str, rel_type: str, to_label: str,
+                           keyed_by_since: bool, concurrent: bool = False) -> str:
+    """
+    UNWIND query MERGEing one relationship per $rows entry.  Both endpoints
+    are MATCHed (an index seek), so they must exist already.
+    """
+    rel_key = " {since: row.since}" if keyed_by_since else ""
+    return _in_transactions(
+        "UNWIND $rows AS row",
+        f"MATCH (a:{from_label} {{name: row.fn}}) "
+        f"MATCH (b:{to_label}   {{name: row.tn}}) "
+        f"MERGE (a)-[r:{rel_type}{rel_key}]->(b) "
+        f"SET r += row.props",
+        concurrent,
+    )
+
+
+def _pack_transactions(statements, batch_size: int, max_ops_per_tx: int) -> list[list[tuple[str, list]]]:
+    """
+    Split ``(query, rows)`` UNWIND statements into *batch_size*-row chunks and
+    pack consecutive chunks into transactions of at most *max_ops_per_tx* rows.
+    """
+    transactions: list[list[tuple[str, list]]] = [[]]
+    ops = 0
+    for query, params in statements:
+        for i in range(0, len(params), batch_size):
+            chunk = params[i:i + batch_size]
+            if ops and ops + len(chunk) > max_ops_per_tx:
+                transactions.append([])
+                ops = 0
+            transactions[-1].append((query, chunk))
+            ops += len(chunk)
+    return [batch for batch in transactions if batch]
+
+
+def _run_batch(tx, batch: list[tuple[str, list]]) -> None:
+    for query, chunk in batch:
+        tx.run(query, rows=chunk).consume()
+
+
+def _new_driver(uri: str, user: str, password: str):
+    # Suppress "unrecognized label" notifications in Neo4j 5.x
+    return GraphDatabase.driver(
+        uri, auth=(user, password),
+        notifications_min_severity="OFF"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_driver(uri: str, user: str, password: str):
+    """One pooled driver per (uri, user, password), shared process-wide."""
+    return _new_driver(uri, user, password)
+
 
 class Neo4jClient:
     """Thin wrapper around the Neo4j driver with MERGE helpers and schema setup."""
 
-    def __init__(self, uri: str, user: str, password: str):
-        # Suppress "unrecognized label" notifications in Neo4j 5.x
-        self.driver = GraphDatabase.driver(
-            uri, auth=(user, password),
-            notifications_min_severity="OFF"
-        )
+    def __init__(self, uri: str, user: str, password: str,
+                 database: str = "neo4j", shared: bool = False):
+        """
+        Args:
+            database: Database every session is pinned to (skips the
+                home-database lookup on session start).
+            shared: Borrow the process-wide driver for these credentials
+                instead of opening a private one; close() then leaves it open.
+        """
+        self.driver = _shared_driver(uri, user, password) if shared else _new_driver(uri, user, password)
+        self.database = database
+        self._owns_driver = not shared
+        self._session = None
+        self._tx = None              # open transaction while inside batch()
+        self._concurrent_tx = None   # resolved on first bulk write
+        self._tokens = None          # (labels, rel types) in use; reset by writes
+
+    def session(self):
+        """
+        The client's long-lived session, opened on first use and reused by
+        every helper below so loops of small writes don't pay session setup
+        per call.  Not thread-safe: use one client per thread.
+        """
+        if self._session is None or self._session.closed():
+            self._session = self.driver.session(database=self.database)
+        return self._session
+
+    @contextmanager
+    def batch(self):
+        """
+        Group merge_entity / merge_relation calls into one write transaction::
+
+            with client.batch():
+                for row in rows:
+                    client.merge_relation(...)
+
+        Commits once on exit (one log flush instead of one per call) and rolls
+        back if the block raises.  Nested batch() blocks join the outer one.
+        """
+        if self._tx is not None:
+            yield self
+            return
+        with self.session().begin_transaction() as tx:
+            self._tx = tx
+            try:
+                yield self
+                tx.commit()
+            finally:
+                self._tx = None
+
+    def _runner(self):
+        """The open batch() transaction, else the long-lived session."""
+        return self._tx if self._tx is not None else self.session()
+
+    def _schema_tokens(self) -> tuple[set[str], set[str]]:
+        """
+        (labels, relationship types) currently in use, fetched in one
+        round-trip and kept until this client's next write.
+        """
+        if self._tokens is None:
+            try:
+                rec = self._runner().run(
+                    "CALL { CALL db.labels() YIELD label RETURN collect(label) AS labels } "
+                    "CALL { CALL db.relationshipTypes() YIELD relationshipType "
+                    "RETURN collect(relationshipType) AS rels } "
+                    "RETURN labels, rels"
+                ).single()
+                self._tokens = (set(rec["labels"]), set(rec["rels"]))
+            except neo4j_exc.ClientError:
+                # e.g. the procedures are not allowed for this user
+                return set(), set()
+        return self._tokens
+
+    def _supports_concurrent_tx(self) -> bool:
+        """
+        True when the server runs ``CALL (row) { } IN CONCURRENT TRANSACTIONS``
+        (Neo4j 5.23+: concurrency arrived in 5.21, the scope clause in 5.23;
+        calendar-versioned 2025.x releases compare higher).
+        """
+        if self._concurrent_tx is None:
+            try:
+                rec = self._runner().run(
+                    "CALL dbms.components() YIELD versions RETURN versions[0] AS v"
+                ).single()
+                major, minor = (int(x) for x in rec["v"].split(".")[:2])
+                self._concurrent_tx = (major, minor) >= (5, 23)
+            except (neo4j_exc.Neo4jError, ValueError, TypeError):
+                self._concurrent_tx = False
+        return self._concurrent_tx
 
     def close(self):
-        self.driver.close()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._owns_driver:
+            self.driver.close()
 
     def __enter__(self):
         return self
@@ -40,27 +227,42 @@ class Neo4jClient:
             return False
 
     def ensure_constraints(self):
-        """Create UNIQUE constraints for every entity type (idempotent)."""
-        with self.driver.session() as s:
+        """
+        Create UNIQUE constraints and the name full-text index (idempotent).
+
+        All schema statements share one transaction (one commit, no per-label
+        round-trip); each constraint's backing range index already serves
+        ``{name: $name}`` lookups, so no separate index is created.
+        """
+        with self.session().begin_transaction() as tx:
             for label in ENTITY_LABELS:
-                s.run(
+                tx.run(
                     f"CREATE CONSTRAINT IF NOT EXISTS "
                     f"FOR (n:{label}) REQUIRE n.name IS UNIQUE"
                 )
+            tx.run(
+                f"CREATE FULLTEXT INDEX {_NAME_FULLTEXT_INDEX} IF NOT EXISTS "
+                f"FOR (n:{'|'.join(ENTITY_LABELS)}) ON EACH [n.name]"
+            )
+            tx.commit()
         print("✅ Schema constraints ensured.", flush=True)
 
     # ── Write helpers ─────────────────────────────────────────────────────────
 
     def merge_entity(self, label: str, name: str, extra_props: dict | None = None) -> None:
-        """MERGE a node by (label, name) and optionally set extra properties."""
+        """MERGE a node by (label, name) and optionally set extra properties.
+
+        Joins the open batch() transaction, if any.
+        """
+        self._tokens = None
         props = extra_props or {}
-        with self.driver.session() as s:
-            s.run(
-                f"MERGE (n:{label} {{name: $name}}) "
-                f"ON CREATE SET n += $props "
-                f"ON MATCH  SET n += $props",
-                name=name.strip(), props=props,
-            )
+        s = self._runner()
+        s.run(
+            f"MERGE (n:{label} {{name: $name}}) "
+            f"ON CREATE SET n += $props "
+            f"ON MATCH  SET n += $props",
+            name=_canon_name(name), props=props,
+        )
 
     def merge_relation(
         self,
@@ -72,163 +274,236 @@ class Neo4jClient:
         """
         MERGE a relationship between two named entities.
         Both nodes are also MERGEd so they don't need to exist beforehand.
+        Joins the open batch() transaction, if any.
         """
+        self._tokens = None
         p = props or {}
         since = p.get("since", "")
-        with self.driver.session() as s:
-            if since:
-                s.run(
-                    f"MERGE (a:{from_label} {{name: $from_name}}) "
-                    f"MERGE (b:{to_label}   {{name: $to_name}}) "
-                    f"MERGE (a)-[r:{rel_type} {{since: $since}}]->(b) "
-                    f"ON CREATE SET r += $props "
-                    f"ON MATCH  SET r += $props",
-                    from_name=from_name.strip(),
-                    to_name=to_name.strip(),
-                    since=since,
-                    props=p,
-                )
-            else:
-                s.run(
-                    f"MERGE (a:{from_label} {{name: $from_name}}) "
-                    f"MERGE (b:{to_label}   {{name: $to_name}}) "
-                    f"MERGE (a)-[r:{rel_type}]->(b) "
-                    f"ON CREATE SET r += $props "
-                    f"ON MATCH  SET r += $props",
-                    from_name=from_name.strip(),
-                    to_name=to_name.strip(),
-                    props=p,
-                )
+        # A truthy `since` is part of the relationship's identity, so each
+        # dated occurrence gets its own edge; otherwise one edge per pair.
+        rel_key = " {since: $since}" if since else ""
+        s = self._runner()
+        s.run(
+            f"MERGE (a:{from_label} {{name: $from_name}}) "
+            f"MERGE (b:{to_label}   {{name: $to_name}}) "
+            f"MERGE (a)-[r:{rel_type}{rel_key}]->(b) "
+            f"SET r += $props",
+            from_name=_canon_name(from_name),
+            to_name=_canon_name(to_name),
+            since=since,
+            props=p,
+        )
 
-    def batch_merge_relations(self, rows: list[dict]) -> None:
+    def batch_merge_relations(self, rows: list[dict], batch_size: int = 1000,
+                              max_ops_per_tx: int = 10_000, concurrency: int = 1) -> None:
         """
         Bulk MERGE relationships.
         Each row: {from_label, from_name, rel_type, to_label, to_name, props}
+
+        Endpoints are MERGEd first, once per distinct (label, name), then the
+        relationships are MERGEd between MATCHed nodes — instead of re-MERGEing
+        both endpoints for every row.  Both passes send one ``UNWIND $rows``
+        query per label (or per (from_label, rel_type, to_label, has-since)
+        group) and *batch_size* rows, in first-seen order.  The queries share
+        explicit transactions of up to *max_ops_per_tx* rows, so the commit
+        (and its log flush) is paid once per transaction.
+
+        On Neo4j 5.23+ each query is instead a single auto-commit query whose
+        *batch_size*-row batches the server commits in parallel.  Should
+        concurrent batches collide (e.g. lock contention on a shared node), the
+        whole call is replayed sequentially — every write is a MERGE, so
+        re-applying already committed rows is harmless.
+
+        On older servers, *concurrency* > 1 shards the relationship rows by
+        endpoint pair and writes the shards from that many sessions at once.
+
+        Inside ``batch()`` the statements instead run in the open transaction
+        (no concurrent or sharded path), so they commit with the block.
         """
-        with self.driver.session() as s:
-            for row in rows:
-                p = row.get("props", {})
-                since = p.get("since", "")
-                if since:
-                    s.run(
-                        f"MERGE (a:{row['from_label']} {{name: $fn}}) "
-                        f"MERGE (b:{row['to_label']}   {{name: $tn}}) "
-                        f"MERGE (a)-[r:{row['rel_type']} {{since: $since}}]->(b) "
-                        f"ON CREATE SET r += $props "
-                        f"ON MATCH  SET r += $props",
-                        fn=row["from_name"].strip(),
-                        tn=row["to_name"].strip(),
-                        since=since,
-                        props=p,
-                    )
-                else:
-                    s.run(
-                        f"MERGE (a:{row['from_label']} {{name: $fn}}) "
-                        f"MERGE (b:{row['to_label']}   {{name: $tn}}) "
-                        f"MERGE (a)-[r:{row['rel_type']}]->(b) "
-                        f"ON CREATE SET r += $props "
-                        f"ON MATCH  SET r += $props",
-                        fn=row["from_name"].strip(),
-                        tn=row["to_name"].strip(),
-                        props=p,
-                    )
+        self._tokens = None
+        # Repeats of one relationship collapse into a single row whose props
+        # are merged in order (same result as successive `r += props`), so no
+        # two rows — or concurrent batches — ever MERGE the same relationship.
+        groups: dict[tuple, dict[tuple, dict]] = defaultdict(dict)
+        nodes: dict[str, dict[str, None]] = defaultdict(dict)   # label → ordered name set
+        for row in rows:
+            p = row.get("props") or {}
+            since = p.get("since", "")
+            fn, tn = _canon_name(row["from_name"]), _canon_name(row["to_name"])
+            nodes[row["from_label"]][fn] = None
+            nodes[row["to_label"]][tn] = None
+            key = (row["from_label"], row["rel_type"], row["to_label"], bool(since))
+            seen = groups[key].get((fn, tn, since))
+            if seen is None:
+                groups[key][(fn, tn, since)] = {"fn": fn, "tn": tn, "since": since, "props": p}
+            else:
+                seen["props"] = {**seen["props"], **p}
+
+        def node_statements(concurrent: bool):
+            for label, names in nodes.items():
+                yield _merge_nodes_query(label, concurrent), list(names)
+
+        def rel_statements(concurrent: bool, shard: int = 0, shards: int = 1):
+            # Both directions of a pair hash to the same shard, so two shards
+            # never lock the same (a, b) pair in opposite order.
+            for key, params in groups.items():
+                rel_rows = [
+                    row for (fn, tn, _), row in params.items()
+                    if shards == 1 or hash((min(fn, tn), max(fn, tn))) % shards == shard
+                ]
+                if rel_rows:
+                    yield _merge_relations_query(*key, concurrent=concurrent), rel_rows
+
+        if self._tx is not None:
+            # Inside batch(): join the open transaction so these rows commit
+            # (or roll back) with the rest of the block.  CALL … IN
+            # TRANSACTIONS and extra sessions cannot run inside it.
+            statements = chain(node_statements(False), rel_statements(False))
+            for batch in _pack_transactions(statements, batch_size, max_ops_per_tx):
+                _run_batch(self._tx, batch)
+            return
+
+        s = self.session()
+        if groups and self._supports_concurrent_tx():
+            try:
+                for query, params in chain(node_statements(True), rel_statements(True)):
+                    s.run(query, rows=params, batch=batch_size).consume()
+                return
+            except neo4j_exc.Neo4jError as e:
+                print(f"⚠️  Concurrent MERGE failed ({e.code}); retrying sequentially", flush=True)
+
+        if concurrency <= 1:
+            statements = chain(node_statements(False), rel_statements(False))
+            for batch in _pack_transactions(statements, batch_size, max_ops_per_tx):
+                with s.begin_transaction() as tx:
+                    _run_batch(tx, batch)
+                    tx.commit()
+            return
+
+        # Client-side sharding: endpoints first on this session, then one
+        # session per shard writing its relationships in parallel.
+        # execute_write retries the transient deadlocks that shards touching
+        # a shared endpoint (e.g. the self node) can still run into.
+        for batch in _pack_transactions(node_statements(False), batch_size, max_ops_per_tx):
+            s.execute_write(_run_batch, batch)
+
+        def write_shard(shard: int) -> None:
+            statements = rel_statements(False, shard, concurrency)
+            with self.driver.session(database=self.database) as shard_session:
+                for batch in _pack_transactions(statements, batch_size, max_ops_per_tx):
+                    shard_session.execute_write(_run_batch, batch)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(write_shard, i) for i in range(concurrency)]:
+                future.result()
 
     # ── Read helpers ──────────────────────────────────────────────────────────
 
     def graph_stats(self) -> dict:
         """Returns {label: count} for all entity labels, avoiding unrecognized label warnings."""
-        stats = {}
-        with self.driver.session() as s:
-            # Get existing labels and types. 
-            # In Neo4j 5.x, CALL db.labels() returns a column called 'label'
-            try:
-                existing_labels = {r["label"] for r in s.run("CALL db.labels()")}
-            except: 
-                # Fallback for different driver/DB versions if 'label' key missing
-                existing_labels = set()
-            
-            try:
-                existing_rels = {r["relationshipType"] for r in s.run("CALL db.relationshipTypes()")}
-            except:
-                existing_rels = set()
-
-            # Labels whose stat card should show the sum of a relationship
-            # property instead of the raw node count.
-            # Artist/Song cards show unique node count; only Activity uses
-            # the aggregated activity_count.
-            _AGG_LABELS = {
-                "Activity": ("INTERESTED_IN", "activity_count"),
-            }
-
-            # Interest card: count unique target nodes of INTERESTED_IN
-            # relationships (they may be labeled Interest or Activity).
-            _REL_COUNT_LABELS = {
-                "Interest": "INTERESTED_IN",
-            }
+        s = self._runner()
+        existing_labels, existing_rels = self._schema_tokens()
+
+        # Labels whose stat card should show the sum of a relationship
+        # property instead of the raw node count.
+        # Artist/Song cards show unique node count; only Activity uses
+        # the aggregated activity_count.
+        _AGG_LABELS = {
+            "Activity": ("INTERESTED_IN", "activity_count"),
+        }
 
-            for label in ENTITY_LABELS:
-                rel_count_rel = _REL_COUNT_LABELS.get(label)
-                if rel_count_rel and rel_count_rel in existing_rels:
-                    # Count distinct target nodes of the relationship
-                    try:
-                        result = s.run(
-                            f"MATCH ()-[:{rel_count_rel}]->(n) "
-                            f"RETURN count(DISTINCT n) AS c"
-                        )
-                        stats[label] = result.single()["c"]
-                    except:
-                        stats[label] = 0
-                elif label in existing_labels:
-                    try:
-                        agg = _AGG_LABELS.get(label)
-                        if agg and agg[0] in existing_rels:
-                            rel_type, prop = agg
-                            result = s.run(
-                                f"MATCH ()-[r:{rel_type}]->(n:{label}) "
-                                f"RETURN coalesce(sum(r.{prop}), count(n)) AS c"
-                            )
-                        else:
-                            result = s.run(f"MATCH (n:{label}) RETURN count(n) AS c")
-                        stats[label] = result.single()["c"]
-                    except:
-                        stats[label] = 0
-                else:
-                    stats[label] = 0
-
-            for rel in REL_TYPES:
-                if rel in existing_rels:
-                    try:
-                        result = s.run(f"MATCH ()-[r:{rel}]->() RETURN count(r) AS c")
-                        stats[f"→{rel}"] = result.single()["c"]
-                    except:
-                        stats[f"→{rel}"] = 0
+        # Interest card: count unique target nodes of INTERESTED_IN
+        # relationships (they may be labeled Interest or Activity).
+        _REL_COUNT_LABELS = {
+            "Interest": "INTERESTED_IN",
+        }
+
+        # Every count goes out in a single UNION ALL round-trip. Plain
+        # `count(n)` / `count(r)` on one label or type is answered from the
+        # counts store, so only the Interest/Activity branches touch data.
+        branches = []
+        for label in ENTITY_LABELS:
+            rel_count_rel = _REL_COUNT_LABELS.get(label)
+            agg = _AGG_LABELS.get(label)
+            if rel_count_rel and rel_count_rel in existing_rels:
+                # Count distinct target nodes of the relationship
+                branches.append(
+                    f"MATCH ()-[:{rel_count_rel}]->(n) "
+                    f"RETURN '{label}' AS k, count(DISTINCT n) AS c"
+                )
+            elif label in existing_labels:
+                if agg and agg[0] in existing_rels:
+                    rel_type, prop = agg
+                    branches.append(
+                        f"MATCH ()-[r:{rel_type}]->(n:{label}) "
+                        f"RETURN '{label}' AS k, coalesce(sum(r.{prop}), count(n)) AS c"
+                    )
                 else:
-                    stats[f"→{rel}"] = 0
+                    branches.append(f"MATCH (n:{label}) RETURN '{label}' AS k, count(n) AS c")
+        for rel in REL_TYPES:
+            if rel in existing_rels:
+                branches.append(f"MATCH ()-[r:{rel}]->() RETURN '→{rel}' AS k, count(r) AS c")
+
+        stats = {label: 0 for label in ENTITY_LABELS}
+        stats.update({f"→{rel}": 0 for rel in REL_TYPES})
+        if branches:
+            for r in s.run("\nUNION ALL\n".join(branches)):
+                stats[r["k"]] = r["c"]
         return stats
 
     def neighbours(self, label: str, name: str, limit: int = 50) -> list[dict]:
         """
         Return all (rel_type, neighbour_label, neighbour_name) for a given node.
+
+        The start node is matched by label so the lookup is a seek on that
+        label's uniqueness index instead of a scan over every node.
         """
-        with self.driver.session() as s:
-            result = s.run(
-                "MATCH (n {name: $name})-[r]-(m) "
-                "RETURN type(r) AS rel, labels(m)[0] AS label, m.name AS name "
-                "LIMIT $limit",
-                name=name, limit=limit,
-            )
-            return [dict(record) for record in result]
+        if label not in ENTITY_LABELS:
+            raise ValueError(f"Unknown entity label: {label!r}")
+        s = self._runner()
+        result = s.run(
+            f"MATCH (n:{label} {{name: $name}})-[r]-(m) "
+            f"RETURN type(r) AS rel, labels(m)[0] AS label, m.name AS name "
+            f"LIMIT $limit",
+            name=_canon_name(name), limit=limit,
+        )
+        return [dict(record) for record in result]
 
     def search_nodes(self, label: str, query: str, limit: int = 20) -> list[str]:
-        """Full-text prefix search on node names."""
-        with self.driver.session() as s:
-            result = s.run(
-                f"MATCH (n:{label}) "
-                f"WHERE toLower(n.name) CONTAINS toLower($q) "
-                f"RETURN n.name AS name ORDER BY n.name LIMIT $limit",
-                q=query, limit=limit,
-            )
-            return [r["name"] for r in result]
+        """Search node names: full-text prefix hits first, then substrings.
+
+        The Lucene-backed ``entity_name_ft`` index answers token-prefix
+        matches ("mar" → "Maria") quickly.  When it returns fewer than
+        *limit* names — or is unavailable, or the query is empty — the rest
+        are filled from a case-insensitive CONTAINS scan, so mid-word
+        matches ("ari" → "Maria") are still found.
+        """
+        s = self._runner()
+        query = _canon_name(query)
+        names: list[str] = []
+        terms = [_LUCENE_SPECIAL_RE.sub(r"\\\1", t) for t in query.split()]
+        if terms:
+            try:
+                result = s.run(
+                    f"CALL db.index.fulltext.queryNodes($index, $q) YIELD node, score "
+                    f"WHERE node:{label} "
+                    f"RETURN node.name AS name ORDER BY score DESC LIMIT $limit",
+                    index=_NAME_FULLTEXT_INDEX,
+                    q=" AND ".join(f"{t}*" for t in terms),
+                    limit=limit,
+                )
+                names = [r["name"] for r in result]
+            except neo4j_exc.Neo4jError:
+                pass
+            if len(names) >= limit:
+                return names
+        result = s.run(
+            f"MATCH (n:{label}) "
+            f"WHERE toLower(n.name) CONTAINS toLower($q) AND NOT n.name IN $seen "
+            f"RETURN n.name AS name ORDER BY n.name LIMIT $limit",
+            q=query, seen=names, limit=limit - len(names),
+        )
+        return names + [r["name"] for r in result]
 
     def top_nodes_by_degree(self, label: str, limit: int = 10,
                             exclude_names: list[str] | None = None) -> list[dict]:
@@ -238,12 +513,13 @@ class Neo4jClient:
 
         For Activity nodes, ``degree`` is the sum of ``activity_count`` stored on
         incoming INTERESTED_IN relationships (i.e. total activities, not just 1
-        per type).  For all other labels the plain relationship count is used.
+        per type).  For all other labels the plain relationship count is used,
+        read per node with a COUNT subquery rather than an expand-and-aggregate.
 
         Args:
             exclude_names: node names to filter out (e.g. the self-identity node).
         """
-        excluded = [n.upper() for n in (exclude_names or [])]
+        excluded = [_canon_name(n).upper() for n in (exclude_names or [])]
         # Labels where "degree" should be a relationship property sum
         _AGG_DEGREE = {
             "Activity": ("INTERESTED_IN", "activity_count"),
@@ -251,29 +527,28 @@ class Neo4jClient:
             "Song":     ("LISTENED_TO",   "play_count"),
         }
 
-        with self.driver.session() as s:
-            agg = _AGG_DEGREE.get(label)
-            if agg:
-                rel_type, prop = agg
-                result = s.run(
-                    f"MATCH (n:{label}) "
-                    f"WHERE NOT toUpper(n.name) IN $excluded "
-                    f"OPTIONAL MATCH ()-[r:{rel_type}]->(n) "
-                    f"RETURN n.name AS name, "
-                    f"coalesce(sum(r.{prop}), count(r)) AS degree "
-                    f"ORDER BY degree DESC LIMIT $limit",
-                    limit=limit, excluded=excluded,
-                )
-            else:
-                result = s.run(
-                    f"MATCH (n:{label}) "
-                    f"WHERE NOT toUpper(n.name) IN $excluded "
-                    f"OPTIONAL MATCH (n)-[r]-() "
-                    f"RETURN n.name AS name, count(r) AS degree "
-                    f"ORDER BY degree DESC LIMIT $limit",
-                    limit=limit, excluded=excluded,
-                )
-            return [{"name": r["name"], "degree": r["degree"]} for r in result]
+        s = self._runner()
+        agg = _AGG_DEGREE.get(label)
+        if agg:
+            rel_type, prop = agg
+            result = s.run(
+                f"MATCH (n:{label}) "
+                f"WHERE NOT toUpper(n.name) IN $excluded "
+                f"OPTIONAL MATCH ()-[r:{rel_type}]->(n) "
+                f"RETURN n.name AS name, "
+                f"coalesce(sum(r.{prop}), count(r)) AS degree "
+                f"ORDER BY degree DESC LIMIT $limit",
+                limit=limit, excluded=excluded,
+            )
+        else:
+            result = s.run(
+                f"MATCH (n:{label}) "
+                f"WHERE NOT toUpper(n.name) IN $excluded "
+                f"RETURN n.name AS name, count {{ (n)--() }} AS degree "
+                f"ORDER BY degree DESC LIMIT $limit",
+                limit=limit, excluded=excluded,
+            )
+        return [{"name": r["name"], "degree": r["degree"]} for r in result]
 
     def interest_profile(self, self_name: str = "ME") -> dict[str, float]:
         """
@@ -281,15 +556,15 @@ class Neo4jClient:
         Queries INTERESTED_IN relationships from the Person node and
         computes relative percentages.
         """
-        with self.driver.session() as s:
-            result = s.run(
-                "MATCH (p:Person {name: $name})-[r:INTERESTED_IN]->(i:Interest) "
-                "RETURN i.name AS interest, "
-                "       CASE WHEN r.weight IS NOT NULL THEN r.weight ELSE 1.0 END AS weight "
-                "ORDER BY weight DESC",
-                name=self_name,
-            )
-            rows = [(r["interest"], r["weight"]) for r in result]
+        s = self._runner()
+        result = s.run(
+            "MATCH (p:Person {name: $name})-[r:INTERESTED_IN]->(i:Interest) "
+            "RETURN i.name AS interest, "
+            "       CASE WHEN r.weight IS NOT NULL THEN r.weight ELSE 1.0 END AS weight "
+            "ORDER BY weight DESC",
+            name=_canon_name(self_name),
+        )
+        rows = [(r["interest"], r["weight"]) for r in result]
 
         if not rows:
             return {}
@@ -302,11 +577,17 @@ def get_client(uri: str | None = None, user: str | None = None,
                password: str | None = None) -> Neo4jClient:
     """
     Returns a Neo4jClient, falling back to config.py defaults.
-    Callers are responsible for closing (use as context manager).
+
+    All clients for the same credentials share one pooled driver, so calling
+    this per request (UI reruns, chat turns) reuses open Bolt connections.
+    Callers are still responsible for closing (use as context manager), which
+    releases the client's session but keeps the shared driver alive.
     """
-    from config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+    from config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_DATABASE
     return Neo4jClient(
         uri      or NEO4J_URI,
         user     or NEO4J_USER,
         password or NEO4J_PASSWORD,
+        database=NEO4J_DATABASE,
+        shared=True,
     )
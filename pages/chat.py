@@ -1,6 +1,6 @@
 """Page: Chat"""
 import streamlit as st
-from rag.resources import load_chroma, load_mappings
+from rag.resources import get_chroma, get_mappings
 from ui.chat import render_chat_tab
 from ui.settings import render_settings, init_settings_defaults
 
@@ -8,8 +8,8 @@ from ui.settings import render_settings, init_settings_defaults
 def page():
     init_settings_defaults()
     settings = render_settings()
-    collection, episodic = load_chroma()
-    id_to_name, name_to_id = load_mappings()
+    collection, episodic = get_chroma()
+    id_to_name, name_to_id = get_mappings()
 
     render_chat_tab(
         collection, episodic, id_to_name, name_to_id,
@@ -1,13 +1,13 @@
 """Page: Data (episodic memory & ingestion)"""
 import streamlit as st
-from rag.resources import load_chroma
+from rag.resources import get_chroma
 from ui.ingest import render_vector_tab
 from ui.settings import render_settings
 
 
 def page():
     render_settings()
-    collection, episodic = load_chroma()
+    collection, episodic = get_chroma()
     render_vector_tab(collection, episodic)
 
 page()
@@ -0,0 +1,84 @@
+"""
+rag/bm25.py — Okapi BM25 over an in-memory inverted index.
+
+Drop-in replacement for rank_bm25.BM25Okapi (same k1/b/epsilon defaults and
+the same scores from `get_scores`). Postings are stored as flat NumPy arrays
+(CSC-style: one contiguous doc-id/tf slice per term), so a query only touches
+the postings of its own terms instead of looping over every document in
+Python. When numba is installed the scoring loop is JIT-compiled and each
+posting list is processed in parallel.
+"""
+from collections import Counter
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # optional: NumPy fallback below
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_terms(term_ids, indptr, doc_ids, tfs, idf, doc_norm, k1, out):
+        for qi in range(term_ids.shape[0]):
+            t = term_ids[qi]
+            w = idf[t]
+            # doc ids are unique within one posting list, so prange is race-free
+            for j in prange(indptr[t], indptr[t + 1]):
+                d  = doc_ids[j]
+                tf = tfs[j]
+                out[d] += w * tf * (k1 + 1.0) / (tf + doc_norm[d])
+else:
+    def _score_terms(term_ids, indptr, doc_ids, tfs, idf, doc_norm, k1, out):
+        for t in term_ids:
+            s, e = indptr[t], indptr[t + 1]
+            d, tf = doc_ids[s:e], tfs[s:e]
+            out[d] += idf[t] * tf * (k1 + 1.0) / (tf + doc_norm[d])
+
+
+class BM25Index:
+    """BM25Okapi-compatible scorer built from a tokenized corpus."""
+
+    def __init__(self, corpus: list[list[str]], k1: float = 1.5, b: float = 0.75,
+                 epsilon: float = 0.25):
+        self.k1 = k1
+        self.b  = b
+        self.corpus_size = len(corpus)
+
+        vocab: dict[str, int] = {}
+        postings: list[list[tuple[int, int]]] = []
+        doc_lens = np.empty(self.corpus_size, dtype=np.float64)
+        for d, tokens in enumerate(corpus):
+            doc_lens[d] = len(tokens)
+            for tok, tf in Counter(tokens).items():
+                t = vocab.setdefault(tok, len(vocab))
+                if t == len(postings):
+                    postings.append([])
+                postings[t].append((d, tf))
+        self.vocab = vocab
+
+        df = np.fromiter((len(p) for p in postings), dtype=np.int64, count=len(postings))
+        self.indptr  = np.zeros(len(postings) + 1, dtype=np.int64)
+        np.cumsum(df, out=self.indptr[1:])
+        self.doc_ids = np.fromiter((d for p in postings for d, _ in p), dtype=np.int64, count=int(self.indptr[-1]))
+        self.tfs     = np.fromiter((tf for p in postings for _, tf in p), dtype=np.float64, count=int(self.indptr[-1]))
+
+        # Same IDF as rank_bm25.BM25Okapi: negative values are floored to
+        # epsilon * mean(idf).
+        n = self.corpus_size
+        idf = np.log(n - df + 0.5) - np.log(df + 0.5)
+        floor = epsilon * (idf.sum() / len(idf)) if len(idf) else 0.0
+        self.idf = np.where(idf < 0, floor, idf)
+
+        avgdl = doc_lens.sum() / n if n else 0.0
+        self.doc_norm = k1 * (1 - b + b * doc_lens / avgdl) if avgdl else np.full(n, k1)
+
+    def get_scores(self, query: list[str]) -> np.ndarray:
+        """BM25 score of every document for `query` (repeated terms count again)."""
+        out = np.zeros(self.corpus_size, dtype=np.float64)
+        term_ids = np.fromiter((self.vocab[q] for q in query if q in self.vocab), dtype=np.int64)
+        if term_ids.size:
+            _score_terms(term_ids, self.indptr, self.doc_ids, self.tfs,
+                         self.idf, self.doc_norm, self.k1, out)
+        return out
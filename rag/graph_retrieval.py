@@ -2,7 +2,7 @@
 rag/graph_retrieval.py — Lookup semantic facts in Neo4j based on LLM intent.
 """
 from graph.neo4j_client import get_client
-from rag.skills import SKILLS_REGISTRY
+from rag.skills import SKILLS_REGISTRY, run_skill
 
 def _format_rel_label(rel: str) -> str:
     """Converts SNAKE_CASE relationships like WAS_FRIENDS_WITH into natural language with tense info."""
@@ -28,7 +28,7 @@ def retrieve_facts(intent: dict) -> list[str]:
         for skill_id in requested_skills:
             if skill_id in SKILLS_REGISTRY:
                 desc = SKILLS_INFO.get(skill_id, "Specialized retrieval results")
-                skill_results = SKILLS_REGISTRY[skill_id]()
+                skill_results = run_skill(skill_id)
                 print(f"[SKILL] Executing {skill_id}... Found {len(skill_results)} results.")
                 if skill_results:
                     facts.append(f"🔍 {desc}:")
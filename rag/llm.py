@@ -1,8 +1,95 @@
 """
-rag/llm.py — Ollama LLM call with thinking-token support.
+rag/llm.py — LLM calls (Ollama or vLLM) with thinking-token support.
 """
+import asyncio
+import functools
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 import ollama
-from config import IDENTITIES
+
+try:
+    import uvloop
+except ImportError:  # optional; not available on Windows
+    uvloop = None
+
+from config import IDENTITIES, LLM_BACKEND, VLLM_URL, OLLAMA_KEEP_ALIVE
+from rag.skills import OLLAMA_TOOLS, SKILLS_REGISTRY, run_skill
+
+# Keep-alive pool shared by every chat call to a host (persona fan-out opens
+# several requests at once).
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+
+@functools.lru_cache(maxsize=None)
+def get_client(ollama_host: str):
+    """
+    Chat client for the configured backend (Ollama, or vLLM via OpenAI API).
+
+    One client per host for the whole process, so its httpx keep-alive pool
+    is reused across calls instead of opening a new connection per request.
+    """
+    if LLM_BACKEND == "vllm":
+        from rag.vllm_client import VLLMClient
+        return VLLMClient(VLLM_URL, limits=_HTTP_LIMITS)
+    return ollama.Client(host=ollama_host, limits=_HTTP_LIMITS)
+
+
+def _make_async_client(ollama_host: str):
+    """
+    Async counterpart of get_client. Async connection pools are bound to the
+    event loop that created them, so this is built once per committee run
+    rather than cached for the process.
+    """
+    if LLM_BACKEND == "vllm":
+        from rag.vllm_client import AsyncVLLMClient
+        return AsyncVLLMClient(VLLM_URL, limits=_HTTP_LIMITS)
+    return ollama.AsyncClient(host=ollama_host, limits=_HTTP_LIMITS)
+
+
+def _run_async(coro):
+    """Run *coro* to completion on a fresh event loop (libuv-backed when available)."""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+# ── Static prompt fragments ───────────────────────────────────────────────────
+# Assembled once at import so each LLM turn only concatenates the per-turn
+# context onto a ready-made preamble.
+_RELATIONSHIP_GUIDE = (
+    "=== RELATIONSHIP INTERPRETATION GUIDE ===\n"
+    "Pay extremely close attention to the tense of semantic facts from the graph.\n"
+    "- 'WAS' or '(PAST relationship)' means the state is HISTORICAL and NO LONGER TRUE.\n"
+    "- 'IS' or '(CURRENT relationship)' means the state is TRUE RIGHT NOW.\n"
+    "Do not confuse past relationships with current ones.\n\n"
+)
+
+_CHAT_PREAMBLE = (
+    "CRITICAL PERSPECTIVE RULE:\n"
+    "You are the core of my mind. When the context mentions 'Romain', it is talking about ME. I am Romain. Always refer to 'Romain' as 'me' or 'I'. Never refer to 'Romain' in the third person.\n\n"
+    + _RELATIONSHIP_GUIDE
+)
+
+_COMMITTEE_PREAMBLE = (
+    "You are participating in an inner committee to help answer a question. "
+    "Provide your perspective based on your psychological identity. Keep your answer focused.\n\n"
+    "CRITICAL PERSPECTIVE RULE:\n"
+    "You are inside our mind. When the retrieved context mentions 'Romain', it is talking about US. We are Romain. Always refer to 'Romain' as 'us' or 'we' (representing the collective system). Never refer to Romain in the third person.\n\n"
+    + _RELATIONSHIP_GUIDE
+)
+
+_SYNTHESIS_PREAMBLE = (
+    "You have listened to the deliberations of your inner committee. "
+    "Now, synthesize a final, balanced, and coherent answer to the user's question, "
+    "taking into account the various perspectives but speaking with one unified voice.\n\n"
+    "CRITICAL PERSPECTIVE RULE:\n"
+    "You are the core of our mind. When the context or deliberations mention 'Romain', it is talking about US. We are Romain. Always refer to 'Romain' as 'us' or 'we' (as the unified, balanced voice of this system). Never refer to Romain in the third person.\n\n"
+    + _RELATIONSHIP_GUIDE
+)
 
 def _build_context_string(docs: list, episodes: list, facts: list) -> str:
     ctx = ""
@@ -48,12 +135,13 @@ RAW CONTEXT:
 CONDENSED MEMORY SUMMARY:
 """.strip()
 
-    client = ollama.Client(host=ollama_host)
+    client = get_client(ollama_host)
     try:
         res = client.chat(
             model=model,
             messages=[{"role": "user", "content": prompt}],
-            options={"temperature": 0.0}
+            options={"temperature": 0.0},
+            keep_alive=OLLAMA_KEEP_ALIVE,
         )
         result = res["message"]["content"].strip()
         if not result:
@@ -65,22 +153,98 @@ CONDENSED MEMORY SUMMARY:
         print(f"Condenser failed: {e}")
         return raw_context, f"Condenser failed: {e}"
 
+# Chat features ("think", "tools") each model has rejected. Learned from the
+# first 400 so later calls leave them out instead of paying a failed
+# round-trip every time.
+_UNSUPPORTED: dict[str, set[str]] = {}
+
+def _drop_unsupported(kwargs: dict) -> None:
+    for key in _UNSUPPORTED.get(kwargs.get("model"), ()):
+        kwargs.pop(key, None)
+
+def _learn_unsupported(kwargs: dict, e: ollama.ResponseError) -> bool:
+    """
+    If *e* is the server rejecting 'think' or 'tools', remember that for this
+    model, strip the parameter from kwargs and return True (caller retries).
+    """
+    err_str = str(e).lower()
+    if e.status_code != 400:
+        return False
+    if "does not support thinking" in err_str:
+        key = "think"
+    elif "tool" in err_str or "function" in err_str:
+        key = "tools"
+    else:
+        return False
+    if key not in kwargs:
+        return False
+    _UNSUPPORTED.setdefault(kwargs.get("model"), set()).add(key)
+    kwargs.pop(key)
+    return True
+
 def _safe_chat(client, kwargs):
     """
     Executes client.chat(**kwargs). If the model rejects the 'think' parameter
     or 'tools' parameter, it dynamically strips them and retries.
     """
+    _drop_unsupported(kwargs)
+    while True:
+        try:
+            return client.chat(**kwargs)
+        except ollama.ResponseError as e:
+            if not _learn_unsupported(kwargs, e):
+                raise
+
+async def _safe_chat_async(client, kwargs):
+    """Async counterpart of _safe_chat for ollama.AsyncClient."""
+    _drop_unsupported(kwargs)
+    while True:
+        try:
+            return await client.chat(**kwargs)
+        except ollama.ResponseError as e:
+            if not _learn_unsupported(kwargs, e):
+                raise
+
+async def _stream_chat_async(client, kwargs, on_partial, interval: float = 0.05):
+    """
+    Streaming counterpart of _safe_chat_async. Calls on_partial(text) with the
+    answer so far (at most every *interval* seconds) and returns the assembled
+    response in the same shape as a non-streaming chat, so _parse_llm_response
+    works unchanged. Backends that cannot stream (vLLM client) answer in one
+    piece; like _safe_chat_async, a request whose think/tools parameter is
+    rejected is retried without it.
+    """
+    _drop_unsupported(kwargs)
+    content, thinking, final = [], [], {}
+    next_emit = 0.0
     try:
-        return client.chat(**kwargs)
+        stream = await client.chat(**{**kwargs, "stream": True})
+        if not hasattr(stream, "__aiter__"):
+            return stream
+        async for chunk in stream:
+            msg = chunk.get("message") or {}
+            if msg.get("thinking"):
+                thinking.append(msg["thinking"])
+            if msg.get("content"):
+                content.append(msg["content"])
+                now = time.perf_counter()
+                if now >= next_emit:
+                    on_partial("".join(content))
+                    next_emit = now + interval
+            if chunk.get("done"):
+                final = chunk
     except ollama.ResponseError as e:
-        err_str = str(e).lower()
-        if e.status_code == 400 and "does not support thinking" in err_str:
-            kwargs.pop("think", None)
-            return client.chat(**kwargs)
-        if e.status_code == 400 and ("tool" in err_str or "function" in err_str):
-            kwargs.pop("tools", None)
-            return client.chat(**kwargs)
-        raise
+        if content or thinking or not _learn_unsupported(kwargs, e):
+            raise
+        return await _stream_chat_async(client, kwargs, on_partial, interval)
+
+    return {
+        "message": {"role": "assistant", "content": "".join(content), "thinking": "".join(thinking)},
+        "prompt_eval_count": final.get("prompt_eval_count") or 0,
+        "eval_count": final.get("eval_count") or 0,
+    }
+
+_THINK_RE = re.compile(r"<think>(.*?)</think>", re.DOTALL)
 
 def _parse_llm_response(resp: dict):
     msg     = resp["message"]
@@ -95,17 +259,16 @@ def _parse_llm_response(resp: dict):
         answer   = content.strip()
 
     # Method 2 (fallback): thinking embedded as <think>…</think> in content
-    elif "<think>" in content and "</think>" in content:
-        ts = content.find("<think>") + 7
-        te = content.find("</think>")
-        thinking = content[ts:te].strip()
-        answer   = content[te + 8:].strip()
-
-    prompt_tok = resp.get("prompt_eval_count", 0)
-    comp_tok   = resp.get("eval_count", 0)
+    elif m := _THINK_RE.search(content):
+        thinking = m.group(1).strip()
+        answer   = content[m.end():].strip()
+
+    # Counts can come back as None (e.g. on a cached prompt), so coerce to 0
+    # before callers sum them.
+    prompt_tok = resp.get("prompt_eval_count") or 0
+    comp_tok   = resp.get("eval_count") or 0
     return thinking, answer, prompt_tok, comp_tok
 
-import json
 
 def translate_to_introspective(question: str, model: str, ollama_host: str) -> str:
     """
@@ -133,12 +296,13 @@ Input: {question}
 Output:
 """.strip()
 
-    client = ollama.Client(host=ollama_host)
+    client = get_client(ollama_host)
     try:
         res = client.chat(
             model=model,
             messages=[{"role": "user", "content": prompt}],
-            options={"temperature": 0.0}
+            options={"temperature": 0.0},
+            keep_alive=OLLAMA_KEEP_ALIVE,
         )
         return res["message"]["content"].strip()
     except Exception as e:
@@ -154,7 +318,7 @@ def filter_irrelevant_context(question: str, docs: list, model: str, ollama_host
     if not docs:
         return docs
         
-    client = ollama.Client(host=ollama_host)
+    client = get_client(ollama_host)
     filtered_docs = []
     
     print(f"\n{'='*50}\n[DEBUG: CONTEXT PURIFICATION ({model})]\n{'='*50}")
@@ -183,7 +347,8 @@ Return ONLY valid JSON matching this schema:
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
                 format="json",
-                options={"temperature": 0.0}
+                options={"temperature": 0.0},
+                keep_alive=OLLAMA_KEEP_ALIVE,
             )
             content = res["message"]["content"]
             result = json.loads(content)
@@ -228,8 +393,6 @@ def call_llm(question: str, docs: list, episodes: list, facts: list,
     Supports Ollama native tool calling — if the model invokes a skill, it runs
     the function, injects the result, and calls the model again for a final answer.
     """
-    from rag.skills import OLLAMA_TOOLS, SKILLS_REGISTRY
-    import json
 
     ctx = _build_context_string(docs, episodes, facts)
     history_text = "\n".join([m.get("content", "") for m in (conversation_history or [])])
@@ -240,23 +403,13 @@ def call_llm(question: str, docs: list, episodes: list, facts: list,
     if enable_condenser and total_est > (num_ctx * condenser_threshold / 100):
         ctx, condenser_stats = condense_context(question, ctx, intent_model, ollama_host)
         print(f"[DEBUG] Condenser Stats: {condenser_stats}")
-    full_system_prompt = (
-        f"{system_prompt}\n\n"
-        f"CRITICAL PERSPECTIVE RULE:\n"
-        f"You are the core of my mind. When the context mentions 'Romain', it is talking about ME. I am Romain. Always refer to 'Romain' as 'me' or 'I'. Never refer to 'Romain' in the third person.\n\n"
-        f"=== RELATIONSHIP INTERPRETATION GUIDE ===\n"
-        f"Pay extremely close attention to the tense of semantic facts from the graph.\n"
-        f"- 'WAS' or '(PAST relationship)' means the state is HISTORICAL and NO LONGER TRUE.\n"
-        f"- 'IS' or '(CURRENT relationship)' means the state is TRUE RIGHT NOW.\n"
-        f"Do not confuse past relationships with current ones.\n\n"
-        f"CONTEXT:\n{ctx}"
-    )
+    full_system_prompt = f"{system_prompt}\n\n{_CHAT_PREAMBLE}CONTEXT:\n{ctx}"
 
     messages = [{"role": "system", "content": full_system_prompt}]
     messages.extend(_build_history_messages(conversation_history))
     messages.append({"role": "user", "content": question})
 
-    client = ollama.Client(host=ollama_host)
+    client = get_client(ollama_host)
     
     # Tools + thinking mode often conflict — prefer tools when thinking is OFF
     # When thinking is ON, tools are disabled but we rely on intent-based skill execution
@@ -266,6 +419,7 @@ def call_llm(question: str, docs: list, episodes: list, facts: list,
         "model": model,
         "messages": messages,
         "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "options": {
             "num_ctx": num_ctx,
             "num_predict": num_predict
@@ -276,20 +430,22 @@ def call_llm(question: str, docs: list, episodes: list, facts: list,
     if enable_thinking:
         chat_kwargs["think"] = True
 
-    import time
     start_t = time.perf_counter()
     resp = _safe_chat(client, chat_kwargs)
 
     # ── Tool Call Handling ────────────────────────────────────────────────────
-    tool_calls = resp.get("message", {}).get("tool_calls", [])
+    message = resp.get("message") or {}
+    tool_calls = message.get("tool_calls") or []
     if tool_calls:
         print(f"\n[TOOL CALLING] Model requested {len(tool_calls)} tool(s):")
         # Append the model's tool-calling message
-        messages.append(resp["message"])
+        messages.append(message)
 
+        calls = []
         for tc in tool_calls:
-            name = tc["function"]["name"]
-            raw_args = tc["function"].get("arguments", {})
+            fn = tc["function"]
+            name = fn["name"]
+            raw_args = fn.get("arguments") or {}
             
             # Normalize arguments
             if isinstance(raw_args, str):
@@ -303,18 +459,30 @@ def call_llm(question: str, docs: list, episodes: list, facts: list,
             print(f"  -> Tool: {name}({args})")
             if tool_callback:
                 tool_callback(name, args)
-
-            if name in SKILLS_REGISTRY:
-                try:
-                    result = SKILLS_REGISTRY[name](**args)
-                    result_str = "\n".join(result) if result else "No results found."
-                    print(f"  -> Tool Result ({name}):\n{result_str}")
-                except Exception as e:
-                    result_str = f"Error executing {name}: {e}"
-                    print(f"  -> Tool Error: {e}")
-            else:
-                result_str = f"Unknown tool: {name}"
-
+            calls.append((name, args))
+
+        def _run_tool(call):
+            name, args = call
+            if name not in SKILLS_REGISTRY:
+                return f"Unknown tool: {name}"
+            try:
+                result = run_skill(name, args)
+                result_str = "\n".join(result) if result else "No results found."
+                print(f"  -> Tool Result ({name}):\n{result_str}")
+            except Exception as e:
+                result_str = f"Error executing {name}: {e}"
+                print(f"  -> Tool Error: {e}")
+            return result_str
+
+        # Skills are independent I/O (Neo4j/Chroma lookups, each on its own
+        # session): run them side by side, keeping results in call order.
+        if len(calls) > 1:
+            with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+                results = list(pool.map(_run_tool, calls))
+        else:
+            results = [_run_tool(call) for call in calls]
+
+        for result_str in results:
             # Inject tool result as a tool role message
             messages.append({
                 "role": "tool",
@@ -326,6 +494,7 @@ def call_llm(question: str, docs: list, episodes: list, facts: list,
             "model": model,
             "messages": messages,
             "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
             "options": {
                 "num_ctx": num_ctx,
                 "num_predict": num_predict
@@ -341,6 +510,14 @@ def call_llm(question: str, docs: list, episodes: list, facts: list,
     thinking, answer, p_tok, c_tok = _parse_llm_response(resp)
     return thinking, answer, p_tok, c_tok, duration, ctx, condenser_stats
 
+def _format_deliberations(deliberations: list) -> str:
+    """Transcript of committee answers, built in one join rather than by +=."""
+    return "".join(
+        f"[{d['persona']} - Round {d['round']}]: {d['response']}\n\n"
+        for d in deliberations
+    )
+
+
 def deliberate_and_synthesize(question: str, docs: list, episodes: list, facts: list,
                                model: str, ollama_host: str, num_ctx: int,
                                active_personas: list, deliberation_rounds: int, 
@@ -353,6 +530,8 @@ def deliberate_and_synthesize(question: str, docs: list, episodes: list, facts:
     """
     Returns (thinking, answer, prompt_tokens, completion_tokens, deliberations).
     Deliberations is a list of dicts: {"persona": name, "round": r, "response": text}
+    When the committee produced a single answer it is returned directly,
+    without a synthesis call.
 
     Parameters
     ----------
@@ -371,9 +550,8 @@ def deliberate_and_synthesize(question: str, docs: list, episodes: list, facts:
         ctx, condenser_stats = condense_context(question, ctx, intent_model, ollama_host)
         print(f"[DEBUG] Condenser Stats: {condenser_stats}")
 
-    client = ollama.Client(host=ollama_host)
+    client = get_client(ollama_host)
 
-    import time
     start_t = time.perf_counter()
 
     # Merge hardcoded identities with discovered ones
@@ -386,100 +564,119 @@ def deliberate_and_synthesize(question: str, docs: list, episodes: list, facts:
     total_prompt_tok = 0
     total_comp_tok = 0
     deliberations = []
+    # Formatted transcript of `deliberations`; each round's answers are
+    # formatted once and appended, rather than re-rendering every round.
+    transcript = ""
     
     # 1. Deliberation Rounds
-    for r in range(1, deliberation_rounds + 1):
-        for persona in active_personas:
-            if persona not in all_identities:
-                continue
-                
-            persona_sys_prompt = all_identities[persona]
-            
-            # Inject previous deliberations into the context for this persona
-            delib_ctx = ""
-            if deliberations:
-                delib_ctx = "\n\n=== PREVIOUS DELIBERATIONS FROM OTHER PERSONAS ===\n"
-                for d in deliberations:
-                    delib_ctx += f"[{d['persona']} - Round {d['round']}]: {d['response']}\n\n"
-                    
-            full_system_prompt = (
-                f"{persona_sys_prompt}\n\n"
-                f"You are participating in an inner committee to help answer a question. "
-                f"Provide your perspective based on your psychological identity. Keep your answer focused.\n\n"
-                f"CRITICAL PERSPECTIVE RULE:\n"
-                f"You are inside our mind. When the retrieved context mentions 'Romain', it is talking about US. We are Romain. Always refer to 'Romain' as 'us' or 'we' (representing the collective system). Never refer to Romain in the third person.\n\n"
-                f"=== RELATIONSHIP INTERPRETATION GUIDE ===\n"
-                f"Pay extremely close attention to the tense of semantic facts from the graph.\n"
-                f"- 'WAS' or '(PAST relationship)' means the state is HISTORICAL and NO LONGER TRUE.\n"
-                f"- 'IS' or '(CURRENT relationship)' means the state is TRUE RIGHT NOW.\n"
-                f"Do not confuse past relationships with current ones.\n\n"
-                f"CONTEXT:\n{ctx}{delib_ctx}"
+    # Deliberate trade-off for concurrency: personas used to run one after
+    # another, each seeing the answers already given earlier in the same
+    # round. They now only see deliberations from previous rounds, which
+    # makes the personas of a round independent so they can be sent to
+    # Ollama concurrently.
+    history_messages = _build_history_messages(conversation_history)
+
+    async def _ask_persona(async_client, persona: str, r: int, shared_prompt: str):
+        persona_sys_prompt = all_identities[persona]
+        # Instructions and identity go last: the shared block in front is
+        # byte-identical for every persona (and each round extends the
+        # previous one), so Ollama can reuse its KV cache for the prefix
+        # instead of re-prefilling it.
+        full_system_prompt = (
+            f"{shared_prompt}\n\n{_COMMITTEE_PREAMBLE}=== YOUR IDENTITY ===\n{persona_sys_prompt}"
+        )
+
+        persona_messages = [{"role": "system", "content": full_system_prompt}]
+        persona_messages.extend(history_messages)
+        persona_messages.append({"role": "user", "content": question})
+
+        chat_kwargs = {
+            "model": model,
+            "messages": persona_messages,
+            "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": {
+                "num_ctx": num_ctx,
+                "num_predict": num_predict
+            },
+        }
+
+        print(f"\n{'='*50}\n[DEBUG: INPUT TO {persona.upper()} (ROUND {r})]\n{'='*50}")
+        print(f"IDENTITY PROMPT:\n{persona_sys_prompt}")
+
+        if enable_thinking:
+            chat_kwargs["think"] = True
+
+        if update_callback:
+            update_callback(persona, r, "working", None)
+
+        if update_callback:
+            resp = await _stream_chat_async(
+                async_client, chat_kwargs,
+                lambda text: update_callback(persona, r, "streaming", text),
             )
-            
-            persona_messages = [{"role": "system", "content": full_system_prompt}]
-            persona_messages.extend(_build_history_messages(conversation_history))
-            persona_messages.append({"role": "user", "content": question})
-
-            chat_kwargs = {
-                "model": model,
-                "messages": persona_messages,
-                "stream": False,
-                "options": {
-                    "num_ctx": num_ctx,
-                    "num_predict": num_predict
-                },
-            }
-            
-            print(f"\n{'='*50}\n[DEBUG: INPUT TO {persona.upper()} (ROUND {r})]\n{'='*50}")
-            # print(f"SYSTEM PROMPT:\n{full_system_prompt}") # Redundant, context already logged
-            print(f"IDENTITY PROMPT:\n{persona_sys_prompt}")
-            # print(f"\nUSER QUESTION:\n{question}\n{'='*50}\n")  # Redundant, logged already
-            
-            if enable_thinking:
-                chat_kwargs["think"] = True
-                
-            if update_callback:
-                update_callback(persona, r, "working", None)
-                
-            resp = _safe_chat(client, chat_kwargs)
-            
-            thinking, answer, p_tok, c_tok = _parse_llm_response(resp)
-            total_prompt_tok += p_tok
-            total_comp_tok += c_tok
-            
-            print(f"[{persona.upper()} ANSWER (Round {r})]:\n{answer}\n{'='*50}")
-            
-            if update_callback:
-                update_callback(persona, r, "done", answer)
-                
-            deliberations.append({
-                "persona": persona,
-                "round": r,
-                "response": answer
-            })
-            
+        else:
+            resp = await _safe_chat_async(async_client, chat_kwargs)
+        thinking, answer, p_tok, c_tok = _parse_llm_response(resp)
+
+        print(f"[{persona.upper()} ANSWER (Round {r})]:\n{answer}\n{'='*50}")
+
+        if update_callback:
+            update_callback(persona, r, "done", answer)
+        return thinking, answer, p_tok, c_tok
+
+    persona_thinking = ""
+
+    async def _run_rounds():
+        nonlocal total_prompt_tok, total_comp_tok, transcript, persona_thinking
+        round_personas = [p for p in active_personas if p in all_identities]
+        # One pooled client for every persona and round; closing it on exit
+        # releases the keep-alive connections bound to this event loop.
+        async with _make_async_client(ollama_host) as async_client:
+            for r in range(1, deliberation_rounds + 1):
+                # Inject previous rounds' deliberations into the context
+                delib_ctx = ""
+                if transcript:
+                    delib_ctx = "\n\n=== PREVIOUS DELIBERATIONS FROM OTHER PERSONAS ===\n" + transcript
+
+                # Everything but the identity prompt is the same for the whole
+                # round, so the (large) context is concatenated once, not per persona.
+                shared_prompt = f"CONTEXT:\n{ctx}{delib_ctx}".rstrip()
+                results = await asyncio.gather(
+                    *(_ask_persona(async_client, p, r, shared_prompt) for p in round_personas)
+                )
+                for persona, (persona_thinking, answer, p_tok, c_tok) in zip(round_personas, results):
+                    total_prompt_tok += p_tok
+                    total_comp_tok += c_tok
+                    deliberations.append({
+                        "persona": persona,
+                        "round": r,
+                        "response": answer
+                    })
+                transcript += _format_deliberations(deliberations[len(deliberations) - len(results):])
+
+    _run_async(_run_rounds())
+
+    # A single committee answer has nothing to reconcile: return it as-is
+    # instead of paying another full prefill + decode to restate it.
+    if len(deliberations) == 1:
+        duration = time.perf_counter() - start_t
+        print("[THE SELF] Single deliberation — skipping synthesis.")
+        answer = deliberations[0]["response"]
+        return (persona_thinking, answer, total_prompt_tok, total_comp_tok,
+                deliberations, duration, ctx, condenser_stats)
+
     # 2. Final Synthesis by "The Self"
     synthesis_sys_prompt = IDENTITIES.get("The Self", "You are the balanced core Self.")
-    delib_ctx = "\n\n=== INNER COMMITTEE DELIBERATION ===\n"
-    if deliberations:
-        for d in deliberations:
-            delib_ctx += f"[{d['persona']} - Round {d['round']}]: {d['response']}\n\n"
-    else:
-        delib_ctx += "No other personas participated.\n\n"
+    delib_ctx = "\n\n=== INNER COMMITTEE DELIBERATION ===\n" + (
+        transcript or "No other personas participated.\n\n"
+    )
         
+    # Same layout as the committee prompts, so the retrieved context they
+    # already prefilled is a cached prefix for the synthesis call too.
     full_system_prompt = (
-        f"{synthesis_sys_prompt}\n\n"
-        f"You have listened to the deliberations of your inner committee. "
-        f"Now, synthesize a final, balanced, and coherent answer to the user's question, "
-        f"taking into account the various perspectives but speaking with one unified voice.\n\n"
-        f"CRITICAL PERSPECTIVE RULE:\n"
-        f"You are the core of our mind. When the context or deliberations mention 'Romain', it is talking about US. We are Romain. Always refer to 'Romain' as 'us' or 'we' (as the unified, balanced voice of this system). Never refer to Romain in the third person.\n\n"
-        f"=== RELATIONSHIP INTERPRETATION GUIDE ===\n"
-        f"Pay extremely close attention to the tense of semantic facts from the graph.\n"
-        f"- 'WAS' or '(PAST relationship)' means the state is HISTORICAL and NO LONGER TRUE.\n"
-        f"- 'IS' or '(CURRENT relationship)' means the state is TRUE RIGHT NOW.\n"
-        f"Do not confuse past relationships with current ones.\n\n"
-        f"CONTEXT:\n{ctx}{delib_ctx}"
+        f"CONTEXT:\n{ctx}{delib_ctx}".rstrip()
+        + f"\n\n{_SYNTHESIS_PREAMBLE}=== YOUR IDENTITY ===\n{synthesis_sys_prompt}"
     )
     
     synthesis_messages = [{"role": "system", "content": full_system_prompt}]
@@ -490,6 +687,7 @@ def deliberate_and_synthesize(question: str, docs: list, episodes: list, facts:
         "model": model,
         "messages": synthesis_messages,
         "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "options": {
             "num_ctx": num_ctx,
             "num_predict": num_predict
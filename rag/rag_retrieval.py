@@ -7,11 +7,15 @@ Pipeline for a semantic query:
   2.  Reciprocal Rank Fusion  → merged, deduplicated ranked list   (if hybrid=True)
   3.  Cross-encoder rerank    → keep top_k by relevance score      (if do_rerank=True)
 """
+import json
 import re
 
+import numpy as np
 import streamlit as st
-from rank_bm25 import BM25Okapi
 
+from config import OLLAMA_KEEP_ALIVE
+from rag.bm25 import BM25Index
+from rag.llm import get_client
 from rag.resources import load_bm25_corpus, load_reranker
 
 
@@ -19,9 +23,6 @@ from rag.resources import load_bm25_corpus, load_reranker
 RRF_K = 60   # standard constant; higher = dampens top-rank advantage
 
 
-import json
-import ollama
-
 # ── Intent Router ─────────────────────────────────────────────────────────────
 
 def analyze_intent(question, model, host, name_to_id={}):
@@ -83,12 +84,13 @@ Return ONLY the JSON. No markdown formatting.
         # print(f"\n{'='*50}\n[DEBUG: INPUT TO INTENT ROUTER ({model})]\n{'='*50}")
         # print(f"PROMPT:\n{prompt}\n{'='*50}\n")
         
-        client = ollama.Client(host=host)
+        client = get_client(host)
         res = client.chat(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             format="json", # Ensure valid json
-            options={"temperature": 0.0}
+            options={"temperature": 0.0},
+            keep_alive=OLLAMA_KEEP_ALIVE,
         )
         content = res["message"]["content"]
         intent = json.loads(content)
@@ -148,7 +150,7 @@ def rerank(query: str, docs: list, top_k: int) -> list:
     Second-pass reranking using a cross-encoder model.
 
     Steps:
-      1. For each doc, score the pair (query, content) with the cross-encoder.
+      1. Score all (query, content) pairs with the cross-encoder in batches of 32.
       2. Sort docs by descending score.
       3. Return the top_k highest-scoring docs.
     """
@@ -157,7 +159,7 @@ def rerank(query: str, docs: list, top_k: int) -> list:
 
     reranker = load_reranker()
     pairs  = [(query, doc["content"]) for doc in docs]
-    scores = reranker.predict(pairs)
+    scores = reranker.predict(pairs, batch_size=32, convert_to_numpy=True, show_progress_bar=False)
 
     for doc, score in zip(docs, scores):
         doc["rerank_score"] = float(score)
@@ -167,12 +169,23 @@ def rerank(query: str, docs: list, top_k: int) -> list:
 
 
 # ── BM25 keyword search ───────────────────────────────────────────────────────
-def keyword_search(query: str, bm25: BM25Okapi, corpus_docs: list,
+def keyword_search(query: str, bm25: BM25Index, corpus_docs: list,
                    n: int, id_to_name: dict) -> list:
     """BM25 keyword search over the full corpus. Returns top-n docs."""
     tokens = query.lower().split()
-    scores = bm25.get_scores(tokens)
-    top_indices = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:n]
+    scores = np.asarray(bm25.get_scores(tokens))
+    n = min(n, len(scores))
+    if n <= 0:
+        return []
+    # O(N) selection of the n-th best score, then order just the winners.
+    # Docs tied at that cut-off are taken in corpus order, and the final
+    # order is descending score with ties by corpus position — the same
+    # result as a stable sorted(..., reverse=True)[:n].
+    kth = np.partition(scores, scores.size - n)[scores.size - n]
+    above = np.flatnonzero(scores > kth)
+    tied = np.flatnonzero(scores == kth)[: n - above.size]
+    top = np.concatenate((above, tied))
+    top_indices = top[np.lexsort((top, -scores[top]))]
     results = []
     for idx in top_indices:
         doc = dict(corpus_docs[idx])
@@ -191,29 +204,32 @@ def rrf_merge(semantic_docs: list, keyword_docs: list) -> list:
 
     Documents are identified by their content string.
     Results are annotated with semantic_rank, bm25_rank, and rrf_score.
+    Ranks are scattered into two dense arrays and fused in one NumPy pass.
     """
-    sem_rank = {d["content"]: i + 1 for i, d in enumerate(semantic_docs)}
-    kw_rank  = {d["content"]: i + 1 for i, d in enumerate(keyword_docs)}
-
-    seen, merged = set(), []
+    pos, uniq = {}, []
     for d in semantic_docs + keyword_docs:
-        key = d["content"]
-        if key not in seen:
-            seen.add(key)
-            doc = dict(d)
-            sr = sem_rank.get(key)
-            kr = kw_rank.get(key)
-            doc["semantic_rank"] = sr
-            doc["bm25_rank"]     = kr
-            rrf = 0.0
-            if sr is not None:
-                rrf += 1.0 / (RRF_K + sr)
-            if kr is not None:
-                rrf += 1.0 / (RRF_K + kr)
-            doc["rrf_score"] = rrf
-            merged.append(doc)
-
-    merged.sort(key=lambda d: d["rrf_score"], reverse=True)
+        if d["content"] not in pos:
+            pos[d["content"]] = len(uniq)
+            uniq.append(d)
+    if not uniq:
+        return []
+
+    sem_rank = np.zeros(len(uniq), dtype=np.int64)   # 0 = not retrieved
+    kw_rank  = np.zeros(len(uniq), dtype=np.int64)
+    for ranks, docs in ((sem_rank, semantic_docs), (kw_rank, keyword_docs)):
+        for i, d in enumerate(docs):
+            ranks[pos[d["content"]]] = i + 1
+
+    rrf = (np.where(sem_rank > 0, 1.0 / (RRF_K + sem_rank), 0.0)
+           + np.where(kw_rank > 0, 1.0 / (RRF_K + kw_rank), 0.0))
+
+    merged = []
+    for j in np.argsort(-rrf, kind="stable"):
+        doc = dict(uniq[j])
+        doc["semantic_rank"] = int(sem_rank[j]) or None
+        doc["bm25_rank"]     = int(kw_rank[j]) or None
+        doc["rrf_score"]     = float(rrf[j])
+        merged.append(doc)
     return merged
 
 
@@ -4,26 +4,28 @@ rag/resources.py — Cached resource loaders (embeddings, reranker, ChromaDB, BM
 All functions use @st.cache_resource so they run once per Streamlit session.
 """
 import json
+import mmap
 import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to stdlib json
+    orjson = None
+
 import streamlit as st
 import chromadb
-from chromadb.utils import embedding_functions
 
 # Disable repetitive HuggingFace progress bars and tokenizer warnings in the Streamlit UI
 os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
-try:
-    import transformers
-    transformers.utils.logging.disable_progress_bar()
-except ImportError:
-    pass
 
-from sentence_transformers import CrossEncoder
-from rank_bm25 import BM25Okapi
+# torch / transformers / sentence-transformers / the BM25 index are imported lazily
+# inside the loaders below so that a cold start (e.g. opening the Dashboard)
+# does not pay their import cost until a model is actually needed.
 
 from config import CHROMA_PATH, COLLECTION_NAME, EPISODIC_NAME, NAME_MAPPING_FILE, EMBEDDING_MODEL
+from rag.embeddings import LazyEmbeddingFunction, quiet_transformers
 
 
 def _get_embedding_model() -> str:
@@ -34,30 +36,6 @@ def _get_embedding_model() -> str:
         return EMBEDDING_MODEL
 
 
-from chromadb.api.types import EmbeddingFunction, Documents, Embeddings
-
-class LazyEmbeddingFunction(EmbeddingFunction[Documents]):
-    def __init__(self, model_name: str):
-        self.model_name = model_name
-        self._ef = None
-
-    def _get_ef(self):
-        if self._ef is None:
-            import torch
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            self._ef = embedding_functions.SentenceTransformerEmbeddingFunction(
-                model_name=self.model_name, device=device
-            )
-        return self._ef
-
-    def __call__(self, input: Documents) -> Embeddings:
-        return self._get_ef()(input)
-
-    def name(self) -> str:
-        # ChromaDB specifically checks for "sentence_transformer" as the name of the built-in provider
-        # so this must match what embedding_functions.SentenceTransformerEmbeddingFunction() returns
-        return "sentence_transformer"
-
 @st.cache_resource(show_spinner="Preparing embeddings…")
 def load_embedding_func(_model_name: str | None = None):
     model = _model_name or _get_embedding_model()
@@ -67,7 +45,14 @@ def load_embedding_func(_model_name: str | None = None):
 @st.cache_resource(show_spinner="Loading reranker…")
 def load_reranker():
     """Cross-encoder for second-pass reranking. Scores (query, doc) pairs."""
-    return CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
+    quiet_transformers()
+    from sentence_transformers import CrossEncoder
+    from rag.embeddings import pick_device
+    device = pick_device()
+    reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2", device=device)
+    if device == "cuda":
+        reranker.model.half()   # FP16 halves memory traffic; scores are only used for ordering
+    return reranker
 
 
 @st.cache_resource(show_spinner="Connecting to ChromaDB…")
@@ -89,6 +74,29 @@ def load_chroma(_embedding_model: str | None = None):
     return collection, episodic
 
 
+# ── Session-state shortcuts ───────────────────────────────────────────────────
+# Pages call these at the top of every rerun. Keeping the handles in
+# st.session_state skips cache_resource's key hashing on each interaction;
+# the generation counter lets reset_chroma() invalidate every session's copy.
+_chroma_generation = 0
+
+
+def get_chroma():
+    """load_chroma(), memoised per session. Returns (collection, episodic)."""
+    cached = st.session_state.get("chroma_handles")
+    if cached is None or cached[0] != _chroma_generation:
+        cached = (_chroma_generation, load_chroma())
+        st.session_state["chroma_handles"] = cached
+    return cached[1]
+
+
+def reset_chroma():
+    """Drop the cached ChromaDB handles (cache_resource and per-session)."""
+    global _chroma_generation
+    load_chroma.clear()
+    _chroma_generation += 1
+
+
 @st.cache_resource(show_spinner="Building BM25 keyword index…")
 def load_bm25_corpus(_collection):
     """
@@ -97,6 +105,8 @@ def load_bm25_corpus(_collection):
 
     Returns (bm25, corpus_docs) where corpus_docs mirrors rag_retrieval() output schema.
     """
+    from rag.bm25 import BM25Index
+
     raw = _collection.get(include=["documents", "metadatas"])
     corpus_docs = []
     tokenized = []
@@ -112,20 +122,35 @@ def load_bm25_corpus(_collection):
             "rerank_score":   None,
         })
         tokenized.append(d.lower().split())
-    bm25 = BM25Okapi(tokenized)
+    bm25 = BM25Index(tokenized)
     return bm25, corpus_docs
 
 
+def _read_json(path: str):
+    """Parse a JSON file, via a read-only mmap + orjson when available."""
+    with open(path, "rb") as f:
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return json.load(f)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as buf:
+            return orjson.loads(buf)
+
+
 @st.cache_resource(show_spinner="Loading name mappings…")
 def load_mappings():
     id_to_name, name_to_id = {}, {}
     try:
         if Path(NAME_MAPPING_FILE).exists():
-            with open(NAME_MAPPING_FILE, "r", encoding="utf-8") as f:
-                id_to_name = json.load(f)
+            id_to_name = _read_json(NAME_MAPPING_FILE)
             for cid, name in id_to_name.items():
                 if name:
                     name_to_id[name.lower()] = cid
     except Exception as e:
         st.warning(f"Name mapping: {e}")
     return id_to_name, name_to_id
+
+
+def get_mappings():
+    """load_mappings(), memoised per session. Returns (id_to_name, name_to_id)."""
+    if "name_mappings" not in st.session_state:
+        st.session_state["name_mappings"] = load_mappings()
+    return st.session_state["name_mappings"]
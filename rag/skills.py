@@ -2,6 +2,10 @@
 rag/skills.py — Specialized high-precision retrieval functions (Skills) for the Digital Twin.
 Exposes Ollama tool definitions so the LLM can call these functions natively.
 """
+import inspect
+import json
+import time
+
 from graph.neo4j_client import get_client
 
 def get_top_played_games(limit=5):
@@ -74,6 +78,37 @@ SKILLS_REGISTRY = {
     "retrieve_top_listened_artists": get_top_listened_artists,
 }
 
+# Skill results only change when new data is ingested. Within one chat turn
+# the intent router's pre-executed skills (graph_retrieval) and the model's
+# own tool calls often ask for the same thing, so results are kept briefly.
+_SKILL_CACHE_TTL = 60.0
+_skill_cache: dict[tuple[str, str], tuple[float, list]] = {}
+
+
+def run_skill(name: str, args: dict | None = None) -> list:
+    """
+    Run SKILLS_REGISTRY[name](**args), reusing a result computed in the last
+    _SKILL_CACHE_TTL seconds. Arguments are bound against the skill's
+    signature first, so `{}` and `{"limit": 5}` share one entry.
+    """
+    fn = SKILLS_REGISTRY[name]
+    bound = inspect.signature(fn).bind(**(args or {}))
+    bound.apply_defaults()
+    key = (name, json.dumps(bound.arguments, sort_keys=True, default=str))
+
+    now = time.monotonic()
+    hit = _skill_cache.get(key)
+    if hit is not None and now - hit[0] < _SKILL_CACHE_TTL:
+        print(f"[SKILL] Cache hit for {name}{dict(bound.arguments)}")
+        return hit[1]
+
+    result = fn(*bound.args, **bound.kwargs)
+    # Skills swallow their own errors and return [], so empty results are
+    # not cached — a transient Neo4j failure should not stick for a minute.
+    if result:
+        _skill_cache[key] = (now, result)
+    return result
+
 # ── Intent Router metadata (used for prompt injection) ────────────────────────
 SKILLS_INFO = {
     "retrieve_most_played_game": "Finds the most frequently played video games or physical activities using graph play counts.",
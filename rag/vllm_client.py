@@ -0,0 +1,142 @@
+"""
+rag/vllm_client.py — Minimal OpenAI-compatible chat client (vLLM) with an
+ollama-shaped interface.
+
+`VLLMClient.chat(**kwargs)` / `AsyncVLLMClient.chat(**kwargs)` accept the same
+keyword arguments rag/llm.py builds for `ollama.Client.chat` and return a dict
+in Ollama's response shape, so `_parse_llm_response` and the tool-calling loop
+work unchanged against either backend. HTTP errors are raised as
+`ollama.ResponseError`, so the think/tools retry in rag/llm.py applies too.
+"""
+import json
+
+import httpx
+import ollama
+
+# Generation can legitimately take minutes, but a hung server must not block
+# the caller (the Streamlit script thread) forever.
+_DEFAULT_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+
+
+def _to_openai_messages(messages: list) -> list:
+    """Convert ollama-style chat messages to the OpenAI schema.
+
+    Ollama tool calls carry dict arguments and tool results carry no id;
+    OpenAI wants JSON-string arguments and a `tool_call_id` on each result,
+    so ids are re-paired in order with the preceding assistant tool calls.
+    """
+    out, pending_ids = [], []
+    for msg in messages:
+        role = msg.get("role")
+        if role == "assistant" and msg.get("tool_calls"):
+            calls = []
+            for i, tc in enumerate(msg["tool_calls"]):
+                fn   = tc["function"]
+                args = fn.get("arguments", {})
+                call_id = tc.get("id") or f"call_{len(out)}_{i}"
+                calls.append({
+                    "id":       call_id,
+                    "type":     "function",
+                    "function": {
+                        "name":      fn["name"],
+                        "arguments": args if isinstance(args, str) else json.dumps(args),
+                    },
+                })
+            pending_ids = [c["id"] for c in calls]
+            out.append({"role": "assistant", "content": msg.get("content") or "", "tool_calls": calls})
+        elif role == "tool":
+            tool_msg = {"role": "tool", "content": msg.get("content", "")}
+            if pending_ids:
+                tool_msg["tool_call_id"] = pending_ids.pop(0)
+            out.append(tool_msg)
+        else:
+            out.append({"role": role, "content": msg.get("content", "")})
+    return out
+
+
+def _build_payload(kwargs: dict) -> dict:
+    options = kwargs.get("options") or {}
+    payload = {
+        "model":    kwargs["model"],
+        "messages": _to_openai_messages(kwargs["messages"]),
+        "stream":   False,
+    }
+    if "num_predict" in options:
+        payload["max_tokens"] = options["num_predict"]
+    if "temperature" in options:
+        payload["temperature"] = options["temperature"]
+    if kwargs.get("tools"):
+        payload["tools"] = kwargs["tools"]
+    if kwargs.get("format") == "json":
+        payload["response_format"] = {"type": "json_object"}
+    # num_ctx is a server-side setting in vLLM (--max-model-len); `think` is
+    # handled by the server's reasoning parser, surfaced as reasoning_content.
+    return payload
+
+
+def _raise_for_status(r: httpx.Response) -> None:
+    """Surface HTTP errors as ollama.ResponseError, like the Ollama client does."""
+    if r.is_error:
+        raise ollama.ResponseError(r.text, r.status_code)
+
+
+def _to_ollama_response(data: dict) -> dict:
+    choice = (data.get("choices") or [{}])[0]
+    msg    = choice.get("message") or {}
+    out_msg = {
+        "role":     "assistant",
+        "content":  msg.get("content") or "",
+        "thinking": msg.get("reasoning_content") or "",
+    }
+    if msg.get("tool_calls"):
+        calls = []
+        for tc in msg["tool_calls"]:
+            fn   = tc.get("function", {})
+            args = fn.get("arguments") or "{}"
+            try:
+                args = json.loads(args) if isinstance(args, str) else args
+            except json.JSONDecodeError:
+                args = {}
+            calls.append({"id": tc.get("id"), "function": {"name": fn.get("name"), "arguments": args}})
+        out_msg["tool_calls"] = calls
+    usage = data.get("usage") or {}
+    return {
+        "model":             data.get("model"),
+        "message":           out_msg,
+        "prompt_eval_count": usage.get("prompt_tokens", 0),
+        "eval_count":        usage.get("completion_tokens", 0),
+        "done":              True,
+    }
+
+
+class VLLMClient:
+    """Synchronous chat client for an OpenAI-compatible /v1 endpoint."""
+
+    def __init__(self, base_url: str, timeout=_DEFAULT_TIMEOUT, **kwargs):
+        self._http = httpx.Client(base_url=base_url.rstrip("/"), timeout=timeout, **kwargs)
+
+    def chat(self, **kwargs) -> dict:
+        r = self._http.post("/chat/completions", json=_build_payload(kwargs))
+        _raise_for_status(r)
+        return _to_ollama_response(r.json())
+
+
+class AsyncVLLMClient:
+    """Async chat client for an OpenAI-compatible /v1 endpoint."""
+
+    def __init__(self, base_url: str, timeout=_DEFAULT_TIMEOUT, **kwargs):
+        self._http = httpx.AsyncClient(base_url=base_url.rstrip("/"), timeout=timeout, **kwargs)
+
+    async def chat(self, **kwargs) -> dict:
+        r = await self._http.post("/chat/completions", json=_build_payload(kwargs))
+        _raise_for_status(r)
+        return _to_ollama_response(r.json())
+
+    async def close(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
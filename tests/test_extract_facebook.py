@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from tools.extract_facebook import extract_messages_from_html, parse_facebook_timestamp
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_html_without_meta_charset_is_read_as_utf8():
+    # No <meta charset>: libxml2 would otherwise guess latin-1 and mangle
+    # accents and emoji.
+    path = FIXTURES / "facebook" / "alice" / "message_1.html"
+
+    messages = extract_messages_from_html(path, target_user="Alice")
+
+    assert [m["text"] for m in messages] == ["Salut ça va ? 😀"]
+    assert messages[0]["sender_name"] == "Alice"
+    assert messages[0]["conversation"] == "alice"
+    assert messages[0]["date"] == "2015-06-18T21:35:16"
+
+
+def test_parse_facebook_timestamp_rejects_out_of_range_values():
+    assert parse_facebook_timestamp("Feb 07, 2015 12:49:17 am") == "2015-02-07T00:49:17"
+    assert parse_facebook_timestamp("Feb 30, 2020 1:00:00 pm") is None
+    assert parse_facebook_timestamp("Jan 1, 2020 1:75:00 pm") is None
@@ -25,16 +25,40 @@ import json
 import os
 import re
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to stdlib json
+    orjson = None
 
+
+# "Jun 18, 2015 9:35:16 pm" — matched directly instead of via strptime,
+# whose locale-aware machinery dominates the per-message cost.
+_TIMESTAMP_RE = re.compile(
+    r"^([A-Za-z]{3}) (\d{1,2}), (\d{4}) (\d{1,2}):(\d{2}):(\d{2}) ([ap]m)$",
+    re.IGNORECASE,
+)
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+
+@lru_cache(maxsize=1 << 16)
 def parse_facebook_timestamp(timestamp_str: str) -> Optional[str]:
     """
     Convert Facebook timestamp to ISO 8601 format.
+
+    Memoised on the raw string: bursts of messages share the same second,
+    so repeats are a dict lookup.  Failures return None silently (so a
+    cached miss is not re-logged); callers report them.
     
     Facebook format examples:
     - "Jun 18, 2015 9:35:16 pm"
@@ -47,14 +71,21 @@ def parse_facebook_timestamp(timestamp_str: str) -> Optional[str]:
     Returns:
         ISO 8601 formatted timestamp string or None if parsing fails
     """
+    m = _TIMESTAMP_RE.match(timestamp_str.strip()) if timestamp_str else None
+    month = _MONTHS.get(m.group(1).lower()) if m else None
+    hour = int(m.group(4)) if m else 0
+    if month is None or not 1 <= hour <= 12:
+        return None
+
+    _, day, year, _, minute, second, meridiem = m.groups()
+    # 12-hour clock → 24-hour: 12 am is 00, 12 pm stays 12
+    hour = hour % 12 + (12 if meridiem.lower() == "pm" else 0)
+    # datetime() does the range checks strptime used to (Feb 30, minute 75…)
     try:
-        # Parse the Facebook timestamp format
-        dt = datetime.strptime(timestamp_str.strip(), "%b %d, %Y %I:%M:%S %p")
-        # Convert to ISO 8601 format
-        return dt.strftime("%Y-%m-%dT%H:%M:%S")
-    except (ValueError, AttributeError) as e:
-        print(f"Warning: Failed to parse timestamp '{timestamp_str}': {e}", flush=True)
+        dt = datetime(int(year), month, int(day), hour, int(minute), int(second))
+    except ValueError:
         return None
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
 
 
 def extract_conversation_name(filepath: Path) -> str:
@@ -77,6 +108,16 @@ def extract_conversation_name(filepath: Path) -> str:
 # This regex captures: (actual text)(emoji)(Name)(space)(repeat of actual text)(emoji)(Name)
 _REACTION_EMOJI_RE = re.compile(r"[^\w\s]")
 
+# Run of emoji that separates the real text from the reacting person's name
+# in a duplicated reaction artifact (see _clean_reaction_duplicate).
+_REACTION_SPLIT_RE = re.compile(
+    r"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF"
+    r"\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF"
+    r"\U00002702-\U000027B0\U0000FE00-\U0000FE0F"
+    r"\U0001F900-\U0001F9FF\U00002600-\U000026FF"
+    r"\U0000200D\U00002764\U0000FE0F❤️👍😆😢😮😡]+"
+)
+
 
 def _clean_reaction_duplicate(text: str) -> str:
     """
@@ -106,12 +147,7 @@ def _clean_reaction_duplicate(text: str) -> str:
             # Strip trailing reaction emoji + name
             # Pattern: "actual message 😆SomeName" → "actual message"
             # Find last emoji character and trim from there
-            parts = re.split(r"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF"
-                             r"\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF"
-                             r"\U00002702-\U000027B0\U0000FE00-\U0000FE0F"
-                             r"\U0001F900-\U0001F9FF\U00002600-\U000026FF"
-                             r"\U0000200D\U00002764\U0000FE0F❤️👍😆😢😮😡]+",
-                             first)
+            parts = _REACTION_SPLIT_RE.split(first)
             cleaned = parts[0].strip() if parts else first
             return cleaned if len(cleaned) >= 2 else first
 
@@ -188,7 +224,7 @@ def is_reaction_message(text: str) -> bool:
     Returns:
         True if message is a reaction, False otherwise
     """
-    return bool(_REACTION_RE.match(text))
+    return _REACTION_RE.match(text) is not None
 
 
 def is_system_message(text: str) -> bool:
@@ -206,36 +242,80 @@ def is_system_message(text: str) -> bool:
     Returns:
         True if message is a system message, False otherwise
     """
-    return bool(_SYSTEM_RE.match(text))
+    return _SYSTEM_RE.match(text) is not None
+
+
+def _class_xpath(tag: str, cls: str) -> etree.XPath:
+    """Compiled XPath for descendant ``<tag>`` elements carrying class *cls*."""
+    return etree.XPath(
+        f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+    )
+
+
+# Compiled once: the per-section lookups of extract_messages_from_html.
+_SENDER_XP = _class_xpath("h2", "_a6-h")
+_FOOTER_XP = _class_xpath("footer", "_a6-o")
+_TIMESTAMP_XP = _class_xpath("div", "_a72d")
+_CONTENT_XP = _class_xpath("div", "_a6-p")
+
+
+def _stripped_strings(el: etree._Element, skip_tag: str = "ul"):
+    """
+    Yield the non-empty, stripped text nodes under *el* in document order
+    (the lxml equivalent of BeautifulSoup's ``stripped_strings``).
+
+    Comment text and whole ``<skip_tag>`` subtrees are skipped, but the text
+    that follows them (their ``tail``) is kept.
+    """
+    if el.text and isinstance(el.tag, str):
+        text = el.text.strip()
+        if text:
+            yield text
+    for child in el:
+        if isinstance(child.tag, str) and child.tag != skip_tag:
+            yield from _stripped_strings(child, skip_tag)
+        if child.tail:
+            tail = child.tail.strip()
+            if tail:
+                yield tail
+
+
+def _first_text(el: etree._Element, xpath: etree.XPath) -> Optional[str]:
+    """Stripped text of the first *xpath* match under *el*, or None if absent."""
+    found = xpath(el)
+    if not found:
+        return None
+    return "".join(_stripped_strings(found[0], skip_tag=""))
 
 
 def extract_messages_from_html(
     filepath: Path,
-    target_user: str
+    target_user: str,
+    only_target_user: bool = False,
 ) -> List[Dict[str, str]]:
     """
     Extract messages from a single Facebook HTML export file.
+
+    The file is streamed with ``lxml.etree.iterparse``: each ``<section>`` is
+    processed as soon as it has been parsed and then freed, so peak memory
+    stays at roughly one message rather than the whole DOM.
     
     Args:
         filepath: Path to the HTML file
         target_user: Name of the user whose messages to extract
+        only_target_user: If True, drop every section not sent by
+            *target_user* right after reading the sender, before the
+            timestamp and content are parsed (default False: the ingest
+            pipeline needs both sides of each conversation).
         
     Returns:
         List of message dictionaries
     """
     messages = []
-    
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            soup = BeautifulSoup(f, "html.parser")
-    except (IOError, UnicodeDecodeError) as e:
-        print(f"Error reading file {filepath}: {e}", flush=True)
-        return messages
-    
     conversation_name = extract_conversation_name(filepath)
     
-    # Find all message sections
-    # Structure: <section class="_a6-g" aria-labelledby="...">
+    # Message section structure:
+    # <section class="_a6-g" aria-labelledby="...">
     #   <h2 class="_2ph_ _a6-h _a6-i">Sender Name</h2>
     #   <div class="_2ph_ _a6-p">
     #     <div><div></div><div>Message content</div>...
@@ -245,92 +325,96 @@ def extract_messages_from_html(
     #   </footer>
     # </section>
     
-    sections = soup.find_all("section", class_="_a6-g")
-    
-    for section in sections:
-        try:
-            # Extract sender name from h2 header
-            sender_header = section.find("h2", class_="_a6-h")
-            if not sender_header:
-                continue
-            
-            sender = sender_header.get_text(strip=True)
-            
-            # Extract timestamp from footer
-            footer = section.find("footer", class_="_a6-o")
-            if not footer:
-                continue
-            
-            timestamp_div = footer.find("div", class_="_a72d")
-            if not timestamp_div:
-                continue
-            
-            timestamp_str = timestamp_div.get_text(strip=True)
-            iso_timestamp = parse_facebook_timestamp(timestamp_str)
-            
-            if not iso_timestamp:
-                continue
-            
-            # Extract message content
-            content_div = section.find("div", class_="_a6-p")
-            if not content_div:
-                continue
-            
-            # Remove ul (reactions) from the tree to isolate them
-            reactions = []
-            for ul in content_div.find_all("ul"):
-                react_text = ul.get_text(separator=" ", strip=True)
-                if react_text:
-                    reactions.append(react_text)
-                ul.decompose() # Remove from DOM so it doesn't appear in text extraction
-
-            # Extract text directly using stripped_strings to avoid nested duplication
-            text_parts = []
-            for text in content_div.stripped_strings:
-                text = text.strip()
-                if text and not text.startswith("IP Address:"):
-                    if text not in text_parts:
+    try:
+        for _, section in etree.iterparse(
+            str(filepath), events=("end",), tag="section", html=True,
+            encoding="utf-8",
+        ):
+            try:
+                if "_a6-g" not in (section.get("class") or "").split():
+                    continue
+
+                # Extract sender name from h2 header
+                sender = _first_text(section, _SENDER_XP)
+                if sender is None:
+                    continue
+                if only_target_user and sender != target_user:
+                    continue
+
+                # Extract timestamp from footer
+                footers = _FOOTER_XP(section)
+                if not footers:
+                    continue
+
+                timestamp_str = _first_text(footers[0], _TIMESTAMP_XP)
+                if timestamp_str is None:
+                    continue
+
+                iso_timestamp = parse_facebook_timestamp(timestamp_str)
+                if not iso_timestamp:
+                    print(f"Warning: Failed to parse timestamp '{timestamp_str}'", flush=True)
+                    continue
+
+                # Extract message content
+                content_divs = _CONTENT_XP(section)
+                if not content_divs:
+                    continue
+
+                # Reactions live in <ul> blocks; _stripped_strings skips them
+                # so they don't leak into the message text.
+                text_parts = []
+                seen = set()
+                for text in _stripped_strings(content_divs[0]):
+                    if text not in seen and not text.startswith("IP Address:"):
+                        seen.add(text)
                         text_parts.append(text)
-            
-            # Join all text parts
-            message_text = " ".join(text_parts).strip()
-            
-            # Clean reaction-duplicate artifacts
-            message_text = _clean_reaction_duplicate(message_text)
-            
-            # Skip empty messages
-            if not message_text:
-                continue
-            
-            # Classify message type: system > reaction > text
-            if is_system_message(message_text):
-                msg_type = "system"
-            elif is_reaction_message(message_text):
-                msg_type = "reaction"
-            else:
-                msg_type = "text"
-            
-            # Create message object
-            message = {
-                "date": iso_timestamp,
-                "sender_name": sender,
-                "source": "facebook",
-                "type": msg_type,
-                "text": message_text,
-                "conversation": conversation_name
-            }
-            
-            messages.append(message)
-            
-        except Exception as e:
-            print(f"Error processing section in {filepath}: {e}", flush=True)
-            continue
+
+                # Join all text parts
+                message_text = " ".join(text_parts).strip()
+
+                # Clean reaction-duplicate artifacts
+                message_text = _clean_reaction_duplicate(message_text)
+
+                # Skip empty messages
+                if not message_text:
+                    continue
+
+                # Classify message type: system > reaction > text
+                if is_system_message(message_text):
+                    msg_type = "system"
+                elif is_reaction_message(message_text):
+                    msg_type = "reaction"
+                else:
+                    msg_type = "text"
+
+                # Create message object
+                message = {
+                    "date": iso_timestamp,
+                    "sender_name": sender,
+                    "source": "facebook",
+                    "type": msg_type,
+                    "text": message_text,
+                    "conversation": conversation_name
+                }
+
+                messages.append(message)
+
+            except Exception as e:
+                print(f"Error processing section in {filepath}: {e}", flush=True)
+            finally:
+                # Free the processed section and everything parsed before it.
+                section.clear(keep_tail=True)
+                while section.getprevious() is not None:
+                    del section.getparent()[0]
+    except (OSError, etree.LxmlError) as e:
+        print(f"Error reading file {filepath}: {e}", flush=True)
     
     return messages
 
 
 # Regex to strip URLs from message text before language detection.
 _URL_RE = re.compile(r"https?://\S+", re.IGNORECASE)
+_MULTISPACE_RE = re.compile(r"\s{2,}")
 
 # Patterns that indicate a message is a Facebook export artefact or link
 # preview rather than actual user prose.  These are skipped during language
@@ -350,7 +434,7 @@ def _clean_for_langdetect(text: str) -> str:
     """Strip URLs and collapse whitespace so ``langdetect`` sees only prose."""
     cleaned = _URL_RE.sub("", text).strip()
     # Collapse multiple spaces left by URL removal
-    return re.sub(r"\s{2,}", " ", cleaned)
+    return _MULTISPACE_RE.sub(" ", cleaned)
 
 
 def _detect_conversation_language(
@@ -464,6 +548,21 @@ def _assign_languages(
     )
 
 
+def _walk_html(root: str):
+    """
+    Recursively yield the paths of ``*.html`` files under *root*.
+
+    ``os.scandir`` reports each entry's type from the directory listing
+    itself, so unlike ``Path.rglob`` no extra ``stat`` call is made per entry.
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_html(entry.path)
+            elif entry.name.endswith(".html"):
+                yield entry.path
+
+
 def _print_html_tree(
     html_files: List[Path],
     base_path: Path,
@@ -564,11 +663,34 @@ def _print_html_tree(
     )
 
 
+def _write_json(path: Path, data: list) -> None:
+    """
+    Write *data* as an indented UTF-8 JSON array (same bytes as
+    ``json.dump(indent=2, ensure_ascii=False)``).
+
+    With orjson the array is serialised one element at a time, so the full
+    document never has to exist in memory next to the message list.
+    """
+    if orjson is None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return
+    with open(path, "wb") as f:
+        f.write(b"[")
+        for i, item in enumerate(data):
+            f.write(b",\n  " if i else b"\n  ")
+            # orjson escapes newlines inside strings, so every raw b"\n" here
+            # is layout; shifting them by two spaces nests the object in the array.
+            f.write(orjson.dumps(item, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+        f.write(b"\n]" if data else b"]")
+
+
 def extract_all_messages(
     data_dir: str,
     target_user: str,
     output_file: Optional[str] = None,
     detect_languages: bool = True,
+    only_target_user: bool = False,
 ) -> List[Dict[str, str]]:
     """
     Extract all messages from Facebook HTML export directory.
@@ -579,6 +701,8 @@ def extract_all_messages(
         output_file: Optional path to save JSON output
         detect_languages: If True, detect language per conversation and add
             a ``"language"`` field to every message (default True).
+        only_target_user: If True, keep only *target_user*'s own messages
+            (see :func:`extract_messages_from_html`).
 
     Returns:
         List of all extracted messages (each dict includes ``"language"``
@@ -590,19 +714,31 @@ def extract_all_messages(
         raise FileNotFoundError(f"Data directory not found: {data_dir}")
 
     all_messages = []
-    html_files = list(data_path.rglob("*.html"))
+    html_files = [Path(p) for p in _walk_html(data_dir)]
 
     print(f"Found {len(html_files)} HTML files to process", flush=True)
 
     # Print folder tree of HTML files
     _print_html_tree(html_files, data_path)
 
-    for i, filepath in enumerate(html_files, 1):
-        if i % 50 == 0:
-            print(f"Processing file {i}/{len(html_files)}...", flush=True)
-
-        messages = extract_messages_from_html(filepath, target_user)
-        all_messages.extend(messages)
+    # Files are independent and parsing is CPU-bound, so fan them out over
+    # worker processes; map() keeps results in file order.
+    workers = min(os.cpu_count() or 1, max(len(html_files), 1))
+    chunksize = max(1, len(html_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        results = ex.map(
+            partial(
+                extract_messages_from_html,
+                target_user=target_user,
+                only_target_user=only_target_user,
+            ),
+            html_files,
+            chunksize=chunksize,
+        )
+        for i, messages in enumerate(results, 1):
+            if i % 50 == 0:
+                print(f"Processing file {i}/{len(html_files)}...", flush=True)
+            all_messages.extend(messages)
 
     # Sort messages by date
     all_messages.sort(key=lambda x: x["date"])
@@ -649,8 +785,7 @@ def extract_all_messages(
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(all_messages, f, indent=2, ensure_ascii=False)
+        _write_json(output_path, all_messages)
 
         print(f"Saved messages to {output_file}", flush=True)
 
@@ -685,6 +820,11 @@ def main():
         action="store_true",
         help="Skip conversation-level language detection",
     )
+    parser.add_argument(
+        "--only-user",
+        action="store_true",
+        help="Keep only messages sent by --user (skips parsing everyone else's)",
+    )
     args = parser.parse_args()
 
     # If CLI args provided, use simple single-directory mode
@@ -694,6 +834,7 @@ def main():
             target_user=args.target_user,
             output_file=args.output_file,
             detect_languages=not args.no_language,
+            only_target_user=args.only_user,
         )
         return
 
@@ -732,6 +873,7 @@ def main():
             target_user=TARGET_USER,
             output_file=None,
             detect_languages=False,  # detect once after merging all folders
+            only_target_user=args.only_user,
         )
 
         all_messages.extend(folder_messages)
@@ -751,8 +893,7 @@ def main():
     output_path = Path(OUTPUT_FILE)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(all_messages, f, indent=2, ensure_ascii=False)
+    _write_json(output_path, all_messages)
 
     print(f"\n✅ Saved {len(all_messages)} total messages to {OUTPUT_FILE}", flush=True)
 
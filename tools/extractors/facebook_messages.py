@@ -32,6 +32,7 @@ Options:
 """
 
 import argparse
+import functools
 import json
 import os
 import re
@@ -47,6 +48,11 @@ if _PROJECT_ROOT not in sys.path:
 from graph.constants import INTEREST_KEYWORDS  # noqa: E402
 from graph.neo4j_client import Neo4jClient     # noqa: E402
 
+try:
+    import ahocorasick
+except ImportError:  # optional: per-topic regex fallback in _detect_interests
+    ahocorasick = None
+
 # ── spaCy models (load lazily) ────────────────────────────────────────────────
 _nlp_fr = None
 _nlp_en  = None
@@ -71,7 +77,29 @@ def _load_nlp():
         _nlp_en = None
 
 
-# INTEREST_KEYWORDS imported from graph.constants above
+# INTEREST_KEYWORDS imported from graph.constants above.
+# Fallback matcher: one alternation per topic, so a hit inside another
+# topic's keyword (e.g. "ai" in "airport") is still found, exactly like the
+# plain substring test.
+_INTEREST_RES = {
+    topic: re.compile("|".join(re.escape(kw.lower()) for kw in kws))
+    for topic, kws in INTEREST_KEYWORDS.items()
+}
+
+
+@functools.cache
+def _interest_automaton():
+    """Every interest keyword in one Aho-Corasick automaton (value: its topics),
+    or None when pyahocorasick is not installed."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for topic, kws in INTEREST_KEYWORDS.items():
+        for kw in kws:
+            kw = kw.lower()
+            automaton.add_word(kw, automaton.get(kw, ()) + (topic,))
+    automaton.make_automaton()
+    return automaton
 
 
 # LIVES_IN triggers
@@ -116,12 +144,15 @@ def _ner_entities(text: str) -> dict[str, list[str]]:
 
 
 def _detect_interests(text: str) -> list[str]:
+    """Topics whose keywords occur in *text* (substring match), in taxonomy order."""
     t = text.lower()
-    found = []
-    for topic, kws in INTEREST_KEYWORDS.items():
-        if any(kw in t for kw in kws):
-            found.append(topic)
-    return found
+    automaton = _interest_automaton()
+    if automaton is None:
+        return [topic for topic, rx in _INTEREST_RES.items() if rx.search(t)]
+    hits = set()
+    for _, topics in automaton.iter(t):   # single pass, overlapping matches included
+        hits.update(topics)
+    return [topic for topic in INTEREST_KEYWORDS if topic in hits]
 
 
 def _has_lives_in_context(text: str) -> bool:
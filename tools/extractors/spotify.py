@@ -216,15 +216,16 @@ def extract(streams: list[dict], self_name: str,
               f"({total_plays:,} plays, {total_hours:,}h)", flush=True)
 
         # ── Device nodes ───────────────────────────────────────────────────
-        for device, count in device_plays.most_common():
-            client.merge_relation(
-                from_label="Person", from_name=self_name,
-                rel_type="USED_DEVICE",
-                to_label="Device",   to_name=device,
-                props={"play_count": count, "source": "spotify"},
-            )
-            print(f"[REL] {self_name!r} --USED_DEVICE--> Device: {device!r} "
-                  f"({count:,} plays)", flush=True)
+        with client.batch():
+            for device, count in device_plays.most_common():
+                client.merge_relation(
+                    from_label="Person", from_name=self_name,
+                    rel_type="USED_DEVICE",
+                    to_label="Device",   to_name=device,
+                    props={"play_count": count, "source": "spotify"},
+                )
+                print(f"[REL] {self_name!r} --USED_DEVICE--> Device: {device!r} "
+                      f"({count:,} plays)", flush=True)
 
     return {"LISTENED": total_plays, "INTERESTED_IN": 1, "USED_DEVICE": len(device_plays)}
 
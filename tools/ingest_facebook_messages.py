@@ -6,13 +6,24 @@ into a persistent ChromaDB instance running in Docker.
 """
 
 import json
+import mmap
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 import pandas as pd
 import numpy as np
-from tqdm.auto import tqdm
-from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to stdlib json
+    orjson = None
 
 # Ensure project root is on sys.path so `config` is importable when run standalone
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -20,23 +31,86 @@ if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
 import chromadb
-from chromadb.utils import embedding_functions
 
 # Set PyTorch memory alloc conf to help prevent OOM on 8GB cards
 os.environ["PYTORCH_CUDA_ALLOC_CONF"] = "expandable_segments:True"
 os.environ["PYTORCH_ALLOC_CONF"] = "expandable_segments:True"
 
-from config import COLLECTION_NAME, CHROMA_PATH, EMBEDDING_MODEL  # noqa: E402
+from config import COLLECTION_NAME, CHROMA_PATH, EMBEDDING_MODEL, DEFAULT_INGEST_BATCH  # noqa: E402
+
+# Message fields the session grouping below actually reads
+_MESSAGE_COLUMNS = ("date", "conversation", "sender_name", "text")
+# Low-cardinality string columns, interned while streaming
+_INTERNED_COLUMNS = ("conversation", "sender_name")
+# Grouped-document fields sent to Chroma (text + metadata)
+_DOC_FIELDS = itemgetter("text", "date", "conversation", "message_count")
+
+
+def load_messages(json_path: str, filter_reactions: bool) -> pd.DataFrame:
+    """
+    Load the extracted messages as a DataFrame, optionally without reactions.
+
+    With ijson the array is streamed record by record into per-column lists,
+    so peak memory is the columns kept rather than one dict per message
+    plus the frame built from them. Without it the file is parsed in one go,
+    by orjson from a read-only mmap when installed.
+    """
+    if ijson is None:
+        with open(json_path, "rb") as f:
+            if orjson is None or os.fstat(f.fileno()).st_size == 0:
+                df = pd.DataFrame(json.load(f))
+            else:
+                # orjson parses straight from the mapped pages: no bytes copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as buf:
+                    df = pd.DataFrame(orjson.loads(buf))
+        if filter_reactions and 'type' in df:
+            df = df[df['type'] != "reaction"]
+        return df
+
+    columns = {c: [] for c in _MESSAGE_COLUMNS}
+    with open(json_path, "rb") as f:
+        for msg in ijson.items(f, "item"):
+            if filter_reactions and msg.get("type") == "reaction":
+                continue
+            for c, values in columns.items():
+                v = msg.get(c)
+                # A handful of conversation ids and sender names repeat across
+                # every message; interning keeps one string object per value.
+                if c in _INTERNED_COLUMNS and isinstance(v, str):
+                    v = sys.intern(v)
+                values.append(v)
+    return pd.DataFrame(columns)
+
+
+def token_lengths(model, texts: list[str], chunk: int = 10_000) -> list[int]:
+    """
+    Per-text token count after truncation to the encoder's max_seq_length,
+    i.e. the length each window is padded against inside a batch. Falls
+    back to character length for models without a tokenizer.
+    """
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return [len(t) for t in texts]
+    lengths = []
+    for i in range(0, len(texts), chunk):
+        input_ids = tokenizer(
+            texts[i:i + chunk], truncation=True, max_length=model.max_seq_length,
+        )["input_ids"]
+        lengths.extend(map(len, input_ids))
+    return lengths
+
 
 def ingest_messages(
     json_file: str = "facebook_messages.json",
     chroma_path: str = ".chroma_data",
     collection_name: str = "virtual_me_knowledge",
-    batch_size: int = 64,
+    batch_size: int = DEFAULT_INGEST_BATCH,
+    encode_batch_size: int = 32,
     session_gap_seconds: int = 8 * 3600,
     max_msgs_per_doc: int = 150,
     reset: bool = True,
     filter_reactions: bool = True,
+    cpu_workers: int = 0,
 ):
     """
     Ingest Facebook messages into ChromaDB.
@@ -45,7 +119,9 @@ def ingest_messages(
         json_file: Path to the JSON file with extracted messages
         chroma_path: Path to store ChromaDB data locally
         collection_name: Name of the collection to create/use
-        batch_size: Number of messages to insert per batch
+        batch_size: Number of documents per collection.upsert() call
+        encode_batch_size: Documents per encoder forward pass; halved automatically on CUDA OOM
+        cpu_workers: Encoder processes to run on CPU-only machines (0/1 = in-process)
     """
     # Load messages
     print(f"Loading messages from {json_file}...", flush=True)
@@ -55,75 +131,72 @@ def ingest_messages(
         print("   Please run the extraction step first (Step 1 in the Vector page)", flush=True)
         print("   or check that the path is correct.", flush=True)
         sys.exit(1)
-    with open(json_path) as f:
-        messages = json.load(f)
-        
-    # Filter out standalone reactions to keep conversational context clean
+    # Standalone reactions are dropped while loading to keep conversational context clean
+    df = load_messages(json_path, filter_reactions)
     if filter_reactions:
-        messages = [m for m in messages if m.get("type", "text") != "reaction"]
-        print(f"Filtered to {len(messages)} core text messages", flush=True)
+        print(f"Filtered to {len(df)} core text messages", flush=True)
     else:
-        print(f"Loaded {len(messages)} total messages (including reactions)", flush=True)
+        print(f"Loaded {len(df)} total messages (including reactions)", flush=True)
     
     # --- CONVERSATION SESSION GROUPING (DYNAMIC TEMPO) ---
     print("Grouping messages by conversation using dynamic tempo...", flush=True)
-    df = pd.DataFrame(messages)
-    df['date'] = pd.to_datetime(df['date'])
+    # Dates come from extract_facebook.py in one fixed ISO layout: an explicit
+    # format skips per-value inference, cache=True reuses repeated timestamps.
+    df['date'] = pd.to_datetime(df['date'], format="%Y-%m-%dT%H:%M:%S", cache=True)
     df = df.sort_values(['conversation', 'date']).reset_index(drop=True)
 
     df['gap'] = df.groupby('conversation')['date'].diff().dt.total_seconds() / 60
     
-    df['local_tempo'] = df.groupby('conversation')['gap'].transform(
-        lambda x: x.rolling(window=5, min_periods=1).mean()
+    # groupby().rolling() runs the windowed mean in Cython for every group;
+    # dropping the group level realigns the result on df's own index.
+    df['local_tempo'] = (
+        df.groupby('conversation', sort=False)['gap']
+        .rolling(window=5, min_periods=1).mean()
+        .reset_index(level=0, drop=True)
     )
     
     base_threshold = session_gap_seconds / 60
     
-    def is_new_session(row):
-        if pd.isna(row['gap']): return True 
-        if row['gap'] > (row['local_tempo'] * 5) and row['gap'] > 15:
-            return True
-        if row['gap'] > base_threshold:
-            return True
-        return False
-
+    # A new session starts at a conversation's first message, after a pause
+    # much longer than the local tempo, or after the absolute gap threshold.
     print("Calculating session boundaries...")
-    tqdm.pandas(desc="Session boundaries", mininterval=0.5, maxinterval=2.0)
-    df['new_session_gap'] = df.progress_apply(is_new_session, axis=1)
-    df['session_id'] = df.groupby('conversation')['new_session_gap'].cumsum()
-
-    def format_block(group):
-        idx = group.index
-        conv_id = group['conversation'].iloc[0]
-        
-        # Pull overlapping context
-        overlap = 2
-        start_idx = max(0, idx[0] - overlap)
-        prev_msgs = df.iloc[start_idx:idx[0]]
-        prev_msgs = prev_msgs[prev_msgs['conversation'] == conv_id]
-        
-        prefix = "\n".join([f"{r['sender_name']}: {r['text']} [CONTEXT]" for _, r in prev_msgs.iterrows()])
-        
-        current_text = "\n".join([f"{row['sender_name']}: {row['text']}" for _, row in group.iterrows()])
-        full_display_text = f"{prefix}\n{current_text}".strip()
-        
-        return {
-            'text': full_display_text,
-            'date': group['date'].min().isoformat(),
-            'conversation': conv_id,
-            'message_count': len(group)
-        }
+    gap = df['gap']
+    df['new_session_gap'] = (
+        gap.isna()
+        | ((gap > df['local_tempo'] * 5) & (gap > 15))
+        | (gap > base_threshold)
+    )
 
+    # Sessions are contiguous runs of rows (df is sorted by conversation, date)
+    # that start wherever new_session_gap is True, so one pass over the block
+    # boundaries slices every document straight out of flat Python lists.
     print("Formatting message blocks...", flush=True)
-    groups = [group for _, group in df.groupby(['conversation', 'session_id'])]
-    with ThreadPoolExecutor() as executor:
-        grouped_docs = list(tqdm(
-            executor.map(format_block, groups), 
-            total=len(groups), 
-            desc="Formatting blocks",
-            mininterval=0.5,
-            maxinterval=2.0
-        ))
+    overlap = 2
+    lines = (df['sender_name'].astype(str) + ": " + df['text'].astype(str)).tolist()
+    convs = df['conversation'].tolist()
+    starts = np.flatnonzero(df['new_session_gap'].to_numpy())
+    # Rows are date-sorted within a conversation, so a block's first date is its min
+    start_dates = df['date'].iloc[starts].tolist()
+    bounds = starts.tolist() + [len(df)]
+
+    grouped_docs = []
+    for start, end, date in zip(bounds, bounds[1:], start_dates):
+        conv_id = convs[start]
+        # Overlapping context: the `overlap` previous messages of the same conversation
+        context = [
+            f"{lines[j]} [CONTEXT]"
+            for j in range(max(0, start - overlap), start)
+            if convs[j] == conv_id
+        ]
+        grouped_docs.append({
+            'text': "\n".join(context + lines[start:end]).strip(),
+            'date': date.isoformat(),
+            'conversation': conv_id,
+            'message_count': end - start,
+        })
+    # The raw messages are no longer needed: release them before the encoder
+    # loads, so peak memory is the model plus the grouped windows only.
+    del df, gap, lines, convs, starts, start_dates, bounds
         
     print(f"\n--- Grouping Summary ---")
     print(f"Total conversation session documents created: {len(grouped_docs)}")
@@ -135,39 +208,39 @@ def ingest_messages(
         json.dump(grouped_docs, f, indent=2)
     print("✅ Saved facebook_messages_grouped_ui.json\n", flush=True)
 
-    # Embedding model — BAAI/bge-m3 (must match retrieval model)
+    # Embedding model — BAAI/bge-m3 (must match retrieval model).
+    # Vectors are computed here in encoder-sized batches and handed to Chroma
+    # pre-computed, instead of letting Chroma call the embedding function.
     import torch
+    from rag.embeddings import LazyEmbeddingFunction, load_sentence_transformer
     device = "cuda" if torch.cuda.is_available() else "cpu"
     print(f"Embedding device: {device.upper()}", flush=True)
 
-    # Use FP16 if on GPU to significantly reduce VRAM usage
-    model_kwargs = {}
-    # if device == "cuda":
-    #     model_kwargs = {"torch_dtype": torch.float16}
-    #     print("Using FP16 (Half Precision) to save VRAM", flush=True)
-    
-    base_embedding_func = embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name=EMBEDDING_MODEL, device=device, model_kwargs=model_kwargs
-    )
-    
-    class ChunkedEmbeddingFunction:
-        """Forces PyTorch to calculate embeddings in extremely small VRAM chunks to prevent OOM
-        while allowing ChromaDB to write to disk in much larger, efficient batches."""
-        def __init__(self, base_func, chunk_size=4):
-            self.base_func = base_func
-            self.chunk_size = chunk_size
-            
-        def __call__(self, input):
-            res = []
-            import torch
-            for i in range(0, len(input), self.chunk_size):
-                res.extend(self.base_func(input[i:i+self.chunk_size]))
-            return res
-            
-        def name(self) -> str:
-            return "sentence_transformer"
-            
-    embedding_func = ChunkedEmbeddingFunction(base_embedding_func, chunk_size=4)
+    model = load_sentence_transformer(EMBEDDING_MODEL, device)
+    if device == "cuda":
+        # FP16 halves activation memory and roughly doubles encoder throughput
+        model = model.half()
+        print("Using FP16 (Half Precision) for the encoder", flush=True)
+    # With several GPUs, one encoder process per device splits each batch;
+    # on CPU, `cpu_workers` processes split it the same way (opt-in).
+    pool = None
+    if device == "cuda" and torch.cuda.device_count() > 1:
+        pool = model.start_multi_process_pool()
+        print(f"Encoding on {torch.cuda.device_count()} GPUs", flush=True)
+    elif device == "cpu" and cpu_workers > 1 and sys.platform != "win32":
+        # Workers are spawned and read OMP_NUM_THREADS at startup: share the
+        # cores out instead of every worker claiming all of them.
+        omp_threads = os.environ.get("OMP_NUM_THREADS")
+        os.environ["OMP_NUM_THREADS"] = str(max(1, (os.cpu_count() or 1) // cpu_workers))
+        try:
+            pool = model.start_multi_process_pool(target_devices=["cpu"] * cpu_workers)
+        finally:
+            if omp_threads is None:
+                del os.environ["OMP_NUM_THREADS"]
+            else:
+                os.environ["OMP_NUM_THREADS"] = omp_threads
+        print(f"Encoding with {cpu_workers} CPU worker processes", flush=True)
+
     # Connect to ChromaDB (persistent local storage)
     chroma_path_expanded = os.path.expanduser(chroma_path)
     print(f"Connecting to ChromaDB at {chroma_path_expanded}...", flush=True)
@@ -189,60 +262,139 @@ def ingest_messages(
         except Exception:
             pass
         
+    # The collection keeps a (lazy) embedding function so query-side code sees
+    # the same configuration; it is never invoked during ingest.
     collection = client.get_or_create_collection(
         name=collection_name,
-        embedding_function=embedding_func
+        embedding_function=LazyEmbeddingFunction(EMBEDDING_MODEL)
     )
     
     print(f"Using collection: {collection_name}", flush=True)
     
-    # Insert in batches
+    # Insert in batches. Chroma's upsert (SQLite + HNSW writes) runs on a
+    # single writer thread while the encoder works on the next batch; at most
+    # one upsert is in flight, so memory stays bounded to two batches.
     total_batches = (len(grouped_docs) + batch_size - 1) // batch_size
-    
-    for batch_idx in range(0, len(grouped_docs), batch_size):
-        batch_docs = grouped_docs[batch_idx:batch_idx + batch_size]
-        
-        # Prepare batch data
-        documents = [doc["text"] for doc in batch_docs]
-        metadatas = [
-            {
-                "date": doc["date"],
-                "conversation": doc["conversation"],
-                "message_count": doc["message_count"],
+
+    # Encode longest-first: every batch holds windows of similar token
+    # length, so the encoder pads far less, and an OOM surfaces on the first
+    # batch rather than hours in. Ids keep each window's grouping position.
+    print("Measuring window token lengths...", flush=True)
+    lengths = token_lengths(model, [doc["text"] for doc in grouped_docs])
+    order = sorted(range(len(grouped_docs)), key=lengths.__getitem__, reverse=True)
+
+    def prep(batch_idx: int) -> tuple[list, list, list]:
+        batch_order = order[batch_idx:batch_idx + batch_size]
+        batch_docs = [grouped_docs[i] for i in batch_order]
+        # One pass: itemgetter pulls all fields per doc in a single C call
+        documents, metadatas = [], []
+        for text, date, conversation, message_count in map(_DOC_FIELDS, batch_docs):
+            documents.append(text)
+            metadatas.append({
+                "date": date,
+                "conversation": conversation,
+                "message_count": message_count,
                 "source": "facebook_windowed"
-            }
-            for doc in batch_docs
-        ]
-        ids = [f"window_{batch_idx + i}" for i in range(len(batch_docs))]
-        
-        # Log before the slow embedding step
-        batch_num = (batch_idx // batch_size) + 1
-        print(f"Embedding batch {batch_num}/{total_batches} ({len(batch_docs)} windows)...", flush=True)
-
-        # Upsert batch (this triggers embedding + write — the slow part)
-        # Using upsert allows resuming if the script crashes midway (just run without --reset)
-        collection.upsert(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
-        
-        # Aggressively clear VRAM to prevent creeping fragmentation over 2000+ batches
-        if device == "cuda":
-            import gc
-            gc.collect()
-            torch.cuda.empty_cache()
-            
-            # Log VRAM usage to identify memory leaks
-            alloc_mb = torch.cuda.memory_allocated() / (1024 * 1024)
-            cache_mb = torch.cuda.memory_reserved() / (1024 * 1024)
-            print(f"[VRAM] Allocated: {alloc_mb:.1f} MB | Cached: {cache_mb:.1f} MB", flush=True)
-            
+            })
+        ids = [f"window_{i}" for i in batch_order]
+        return documents, metadatas, ids
+
+    def finish(future, batch_num: int, n_docs: int) -> None:
+        if future is not None:
+            future.result()  # re-raises any upsert error
         pct = int(batch_num / total_batches * 100)
         print(f"PROGRESS: {pct}% | {batch_num}/{total_batches}", flush=True)
         print(f"✅ Batch {batch_num}/{total_batches} done", flush=True)
-        print(f"Inserted batch {batch_num}/{total_batches} ({len(batch_docs)} windows)", flush=True)
-    
+        print(f"Inserted batch {batch_num}/{total_batches} ({n_docs} windows)", flush=True)
+
+    def encode(documents: list[str]):
+        # Identical windows (e.g. repeated one-line exchanges) sort next to
+        # each other; each distinct text is encoded once and its vector reused.
+        unique = list(dict.fromkeys(documents))
+        if len(unique) < len(documents):
+            position = {text: i for i, text in enumerate(unique)}
+            return encode_unique(unique)[[position[text] for text in documents]]
+        return encode_unique(documents)
+
+    def encode_unique(documents: list[str]):
+        nonlocal encode_batch_size
+        if pool is not None:
+            return model.encode_multi_process(documents, pool, batch_size=encode_batch_size)
+        # Long session windows can overflow small GPUs: on OOM the encode
+        # batch is halved and retried, and the smaller size is kept for
+        # the rest of the run instead of failing the whole ingest.
+        while True:
+            try:
+                with torch.inference_mode():
+                    return model.encode(
+                        documents,
+                        batch_size=encode_batch_size,
+                        convert_to_numpy=True,
+                        show_progress_bar=False,
+                    )
+            except torch.cuda.OutOfMemoryError:
+                if encode_batch_size == 1:
+                    raise
+                encode_batch_size //= 2
+                torch.cuda.empty_cache()
+                print(f"⚠️ CUDA out of memory — retrying with encode batch size {encode_batch_size}", flush=True)
+
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        pending = None
+        for batch_idx in range(0, len(grouped_docs), batch_size):
+            documents, metadatas, ids = prep(batch_idx)
+
+            batch_num = (batch_idx // batch_size) + 1
+            if not reset:
+                # Resuming: windows already stored under the same id with the
+                # same text are not re-encoded.
+                stored = collection.get(ids=ids, include=["documents"])
+                stored = dict(zip(stored["ids"], stored["documents"]))
+                keep = [i for i, (id_, text) in enumerate(zip(ids, documents)) if stored.get(id_) != text]
+                if len(keep) < len(ids):
+                    print(f"Skipping {len(ids) - len(keep)} already stored windows", flush=True)
+                    documents = [documents[i] for i in keep]
+                    metadatas = [metadatas[i] for i in keep]
+                    ids = [ids[i] for i in keep]
+                if not ids:
+                    if pending is not None:
+                        finish(*pending)
+                    pending = (None, batch_num, 0)
+                    continue
+
+            # Log before the slow embedding step
+            print(f"Embedding batch {batch_num}/{total_batches} ({len(documents)} windows)...", flush=True)
+
+            embeddings = encode(documents)
+
+            if pending is not None:
+                finish(*pending)
+            # Using upsert allows resuming if the script crashes midway (just run without --reset)
+            future = writer.submit(
+                collection.upsert,
+                documents=documents,
+                metadatas=metadatas,
+                embeddings=embeddings.tolist(),
+                ids=ids,
+            )
+            pending = (future, batch_num, len(documents))
+
+            # Aggressively clear VRAM to prevent creeping fragmentation over 2000+ batches
+            if device == "cuda":
+                import gc
+                gc.collect()
+                torch.cuda.empty_cache()
+
+                # Log VRAM usage to identify memory leaks
+                alloc_mb = torch.cuda.memory_allocated() / (1024 * 1024)
+                cache_mb = torch.cuda.memory_reserved() / (1024 * 1024)
+                print(f"[VRAM] Allocated: {alloc_mb:.1f} MB | Cached: {cache_mb:.1f} MB", flush=True)
+
+        if pending is not None:
+            finish(*pending)
+    if pool is not None:
+        model.stop_multi_process_pool(pool)
+
     print(f"\n✅ Brain successfully installed!", flush=True)
     print(f"   Total conversation windows: {len(grouped_docs)}", flush=True)
     print(f"   Collection: {collection_name}", flush=True)
@@ -259,7 +411,12 @@ if __name__ == "__main__":
                         help="Path to ChromaDB persistent storage")
     parser.add_argument("--collection",   default="virtual_me_knowledge",
                         help="ChromaDB collection name")
-    parser.add_argument("--batch-size",   type=int,   default=8)
+    parser.add_argument("--batch-size",   type=int,   default=DEFAULT_INGEST_BATCH,
+                        help="Documents per ChromaDB upsert (default: %(default)s)")
+    parser.add_argument("--encode-batch-size", type=int, default=32,
+                        help="Documents per embedding forward pass (default: %(default)s)")
+    parser.add_argument("--cpu-workers", type=int, default=0,
+                        help="Encoder processes on CPU-only machines; 4-8 is typical (default: in-process)")
     parser.add_argument("--session-gap",  type=int,   default=8*3600,
                         help="Session gap in seconds (default: 8h = 28800)")
     parser.add_argument("--max-msgs",     type=int,   default=150,
@@ -275,8 +432,10 @@ if __name__ == "__main__":
         chroma_path=args.chroma_path,
         collection_name=args.collection,
         batch_size=args.batch_size,
+        encode_batch_size=args.encode_batch_size,
         session_gap_seconds=args.session_gap,
         max_msgs_per_doc=args.max_msgs,
         reset=args.reset,
         filter_reactions=args.filter_reactions,
+        cpu_workers=args.cpu_workers,
     )
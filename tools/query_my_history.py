@@ -9,6 +9,7 @@ import chromadb
 from chromadb.utils import embedding_functions
 import ollama
 from neo4j import GraphDatabase
+import functools
 import json
 import re
 import os
@@ -17,6 +18,16 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import EMBEDDING_MODEL
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to stdlib json
+    orjson = None
+
 # --- CONFIGURATION ---
 CHROMA_PATH = "./.chroma_data"
 COLLECTION_NAME = "virtual_me_knowledge"
@@ -36,8 +47,8 @@ def load_mappings():
     
     try:
         if Path(NAME_MAPPING_FILE).exists():
-            with open(NAME_MAPPING_FILE, 'r', encoding='utf-8') as f:
-                id_to_name = json.load(f)
+            with open(NAME_MAPPING_FILE, 'rb') as f:
+                id_to_name = orjson.loads(f.read()) if orjson is not None else json.load(f)
                 # Create reverse mapping: lowercase name -> ID
                 for cid, name in id_to_name.items():
                     if name:
@@ -135,6 +146,50 @@ def query_graph_context(person_name):
     
     return ""
 
+@functools.cache
+def _name_automata():
+    """
+    Aho-Corasick automata over REVERSE_NAME_MAPPING for detect_smart_filter,
+    built once: full names, names without spaces, and name parts (the last
+    two only when >= 3 chars). Each key maps to the mapping-order rank of the
+    first name producing it. Returns (names, exact, spaceless, parts).
+    """
+    names = list(REVERSE_NAME_MAPPING)
+    keys = ({}, {}, {})
+    for rank, name in enumerate(names):
+        keys[0].setdefault(name, rank)
+        name_normalized = name.replace(' ', '')
+        if len(name_normalized) >= 3:
+            keys[1].setdefault(name_normalized, rank)
+        for part in name.split():
+            if len(part) >= 3:
+                keys[2].setdefault(part, rank)
+
+    automata = []
+    for words in keys:
+        automaton = None
+        if words:
+            automaton = ahocorasick.Automaton()
+            for word, rank in words.items():
+                automaton.add_word(word, rank)
+            automaton.make_automaton()
+        automata.append(automaton)
+    return (names, *automata)
+
+
+def _first_match(automaton, text):
+    """Lowest rank among the automaton's keys found in `text`, or None."""
+    if automaton is None:
+        return None
+    return min((rank for _, rank in automaton.iter(text)), default=None)
+
+
+@functools.lru_cache(maxsize=None)
+def _mention_re(name):
+    """Compiled "about/mentioning <name>" pattern, built once per friend name."""
+    return re.compile(fr"\b(about|mentioning)\s+{re.escape(name)}\b")
+
+
 def detect_smart_filter(question):
     """
     Decides whether to apply a strict conversation filter or a global search.
@@ -146,45 +201,58 @@ def detect_smart_filter(question):
     4. Otherwise -> No Filter (Global Semantic Search).
     """
     question_lower = question.lower()
+    question_normalized = question_lower.replace(' ', '')
     
     # Try exact match first, then partial match
     matched_name = None
     matched_id = None
     
-    # First pass: exact match
-    for name, conversation_id in REVERSE_NAME_MAPPING.items():
-        if name in question_lower:
-            matched_name = name
-            matched_id = conversation_id
-            break
-    
-    # Second pass: partial match (e.g., "lois" matches "loisnormand")
-    if not matched_name:
-        # Normalize the question: remove spaces and lowercase for better matching
-        question_normalized = question_lower.replace(' ', '')
-        
+    if ahocorasick is not None:
+        # One automaton walk per pass; the earliest name in mapping order
+        # wins, as with the sequential scans below.
+        names, exact, spaceless, parts = _name_automata()
+        rank = _first_match(exact, question_lower)
+        if rank is None:
+            rank = min(
+                (r for r in (_first_match(spaceless, question_normalized),
+                             _first_match(parts, question_lower)) if r is not None),
+                default=None,
+            )
+        if rank is not None:
+            matched_name = names[rank]
+            matched_id = REVERSE_NAME_MAPPING[matched_name]
+    else:
+        # First pass: exact match
         for name, conversation_id in REVERSE_NAME_MAPPING.items():
-            # Check if the normalized name appears in the normalized question
-            name_normalized = name.replace(' ', '')
-            if len(name_normalized) >= 3 and name_normalized in question_normalized:
+            if name in question_lower:
                 matched_name = name
                 matched_id = conversation_id
                 break
-            
-            # Also try matching individual parts of the name
-            name_parts = name.split()
-            for part in name_parts:
-                if len(part) >= 3 and part in question_lower:
+        
+        # Second pass: partial match (e.g., "lois" matches "loisnormand")
+        if not matched_name:
+            for name, conversation_id in REVERSE_NAME_MAPPING.items():
+                # Check if the normalized name appears in the normalized question
+                name_normalized = name.replace(' ', '')
+                if len(name_normalized) >= 3 and name_normalized in question_normalized:
                     matched_name = name
                     matched_id = conversation_id
                     break
-            if matched_name:
-                break
+                
+                # Also try matching individual parts of the name
+                name_parts = name.split()
+                for part in name_parts:
+                    if len(part) >= 3 and part in question_lower:
+                        matched_name = name
+                        matched_id = conversation_id
+                        break
+                if matched_name:
+                    break
     
     if matched_name and matched_id:
         # Check for explicitly "about [name]" -> Global Search
         # This allows searching across ALL conversations for mentions of this person
-        if re.search(fr"\b(about|mentioning)\s+{re.escape(matched_name)}\b", question_lower):
+        if _mention_re(matched_name).search(question_lower):
             return None, matched_name, "Global (Mention)"
             
         # Default behavior: If a name is mentioned, assume we want to query that conversation
@@ -239,31 +307,31 @@ def ask_facebook_history(question: str, show_sources: bool = True):
                     
         # B. Retrieve Messages (Granular memory)
         if strategy == "Strict (Conversation)" and where_filter:
-            # Load the ENTIRE conversation with this person (no semantic search)
-            # Get all messages from this conversation, sorted by date
-            results = collection.get(
-                where=where_filter,
-                include=['metadatas', 'documents']
-            )
+            # Load the conversation with this person (no semantic search):
+            # rank every window by date from metadata alone, then fetch the
+            # documents of the most recent ones only.
+            max_messages = 100
+            index = collection.get(where=where_filter, include=['metadatas'])
             
-            # Sort by date and take the most recent messages (or all if < 100)
-            if results['metadatas']:
-                # Combine documents and metadata, then sort by date
-                messages = list(zip(results['documents'], results['metadatas']))
-                messages.sort(key=lambda x: x[1].get('date', ''), reverse=True)
+            if index['metadatas']:
+                recent = sorted(
+                    range(len(index['ids'])),
+                    key=lambda i: index['metadatas'][i].get('date', ''),
+                    reverse=True,
+                )[:max_messages]
+                top_ids = [index['ids'][i] for i in recent]
+                top = collection.get(ids=top_ids, include=['metadatas', 'documents'])
+                # get(ids=...) does not promise to keep the requested order
+                by_id = dict(zip(top['ids'], zip(top['documents'], top['metadatas'])))
                 
-                # Take up to 100 most recent messages
-                max_messages = 100
-                messages = messages[:max_messages]
-                
-                # Unpack back into separate lists
-                results['documents'] = [msg[0] for msg in messages]
-                results['metadatas'] = [msg[1] for msg in messages]
+                results = {
+                    'documents': [by_id[i][0] for i in top_ids],
+                    'metadatas': [by_id[i][1] for i in top_ids],
+                }
                 
                 print(f"   ↳ 📚 Loaded {len(results['documents'])} messages from this conversation")
             else:
-                results['documents'] = []
-                results['metadatas'] = []
+                results = {'documents': [], 'metadatas': []}
         else:
             # Use semantic search for global queries
             results = collection.query(
@@ -291,15 +359,18 @@ def ask_facebook_history(question: str, show_sources: bool = True):
     documents = results['documents']
     metadatas = results['metadatas']
 
-    for doc, meta in zip(documents, metadatas):
-        date = meta.get('date', 'Unknown')
-        sender = meta.get('sender_name', 'Unknown Sender')
-        conv_id = meta.get('conversation', 'Unknown')
-        
-        # If we are doing a global search, it's helpful to see WHICH friend the chat was with
-        chat_partner = NAME_MAPPING.get(conv_id, "Unknown Chat")
-        
-        context_messages.append(f"[{date}] [Chat: {chat_partner}] {sender}: {doc}")
+    # If we are doing a global search, it's helpful to see WHICH friend the chat was with.
+    # Hits cluster in a few conversations: resolve each partner name once.
+    chat_partners = {
+        conv_id: NAME_MAPPING.get(conv_id, "Unknown Chat")
+        for conv_id in {meta.get('conversation', 'Unknown') for meta in metadatas}
+    }
+    context_messages = [
+        f"[{meta.get('date', 'Unknown')}] "
+        f"[Chat: {chat_partners[meta.get('conversation', 'Unknown')]}] "
+        f"{meta.get('sender_name', 'Unknown Sender')}: {doc}"
+        for doc, meta in zip(documents, metadatas)
+    ]
     
     # Combine episodes, graph, and messages
     context_data = ""
@@ -94,15 +94,17 @@ def render_chat_tab(collection, episodic, id_to_name, name_to_id,
                             
                             def render_doc(d):
                                 # Determine source icon/color
-                                from config import SOURCES
-                                s_meta = next((s for s in SOURCES if s["id"] == d.get("source")), {"icon": "description", "color": "#64748b"})
-                                label = f":material/{s_meta['icon']}: {d.get('date', 'Unknown Date')} · {d.get('friend', 'Unknown')}"
+                                from config import SOURCES_BY_ID
+                                s_meta = SOURCES_BY_ID.get(d.get("source"))
+                                s_icon  = s_meta.icon  if s_meta else "description"
+                                s_color = s_meta.color if s_meta else "#64748b"
+                                label = f":material/{s_icon}: {d.get('date', 'Unknown Date')} · {d.get('friend', 'Unknown')}"
                                 score = d.get("rerank_score", 0)
                                 if score != 0:
                                     label += f" · Relevance: {score:.2f}"
                                 
                                 with st.container(border=True):
-                                    st.caption(f'<span style="color: {s_meta["color"]}; font-weight: bold;">{label}</span>', unsafe_allow_html=True)
+                                    st.caption(f'<span style="color: {s_color}; font-weight: bold;">{label}</span>', unsafe_allow_html=True)
                                     st.markdown(d.get("content", ""))
 
                             if t_docs:
@@ -284,16 +286,29 @@ def render_chat_tab(collection, episodic, id_to_name, name_to_id,
                 with st.status("Inner Deliberation Committee", expanded=True) as status:
                     from rag.llm import deliberate_and_synthesize
                     
+                    # One placeholder per persona/round: streamed partial text
+                    # and the final answer are written into the same box.
+                    answer_slots = {}
+
+                    def _answer_slot(persona, round_num):
+                        key = (persona, round_num)
+                        if key not in answer_slots:
+                            st.markdown(f"**{persona} (Round {round_num})**")
+                            answer_slots[key] = st.empty()
+                        return answer_slots[key]
+
                     def ui_callback(persona, round_num, state, response_text):
                         if state == "working":
                             if persona == "The Self":
                                 status.update(label="The Self is synthesizing...", state="running")
                             else:
                                 status.update(label=f"Committee deliberating: {persona} is speaking (Round {round_num})...", state="running")
+                        elif state == "streaming":
+                            if persona != "The Self":
+                                _answer_slot(persona, round_num).info(response_text + " ▌")
                         elif state == "done":
                             if persona != "The Self":
-                                st.markdown(f"**{persona} (Round {round_num})**")
-                                st.info(response_text)
+                                _answer_slot(persona, round_num).info(response_text)
 
                     try:
                         from rag.llm import _build_context_string
@@ -6,7 +6,7 @@ import streamlit as st
 import pandas as pd
 import pathlib
 
-from config import SOURCES, DATA_DIR
+from config import SOURCES, DATA_DIR, matches_source
 
 from config import NEO4J_URI, SELF_NAME
 from graph.neo4j_client import get_client, Neo4jClient
@@ -25,6 +25,14 @@ def _try_connect(uri=None, user=None, password=None) -> tuple[Neo4jClient | None
         return None, False
 
 
+@st.cache_data(ttl=5, show_spinner=False)
+def _cached_graph_stats(uri=None, user=None, password=None) -> dict:
+    """graph_stats() memoised per connection for a few seconds, so widget
+    interactions that rerun the page don't re-issue the count query."""
+    with get_client(uri=uri, user=user, password=password) as c:
+        return c.graph_stats()
+
+
 def _render_interest_chart_from_data(data: dict):
     """Renders a Plotly radar chart from interest profile data {name: percentage}."""
     if not data:
@@ -98,14 +106,13 @@ def scan_data_sources() -> dict:
     """
     result = {}
     for src in SOURCES:
-        folder = DATA_DIR / src["data_folder"]
+        folder = DATA_DIR / src.data_folder
         files  = []
         if folder.exists():
-            for pat in src["file_patterns"]:
-                files.extend(f for f in folder.glob(pat)
-                             if f.is_file() and f.suffix != ".md")
+            files = [f for f in folder.iterdir()
+                     if f.suffix != ".md" and matches_source(f.name, src.id) and f.is_file()]
         total_bytes = sum(f.stat().st_size for f in files)
-        result[src["id"]] = {"files": files, "size_mb": total_bytes / 1_048_576}
+        result[src.id] = {"files": files, "size_mb": total_bytes / 1_048_576}
     return result
 
 
@@ -113,7 +120,7 @@ def source_chroma_counts(collection) -> dict:
     """Returns {chroma_source_value: doc_count} for each known source."""
     counts = {}
     for src in SOURCES:
-        cs = src["chroma_source"]
+        cs = src.chroma_source
         try:
             result   = collection.get(where={"source": {"$eq": cs}}, include=[])
             counts[cs] = len(result["ids"])
@@ -133,7 +140,7 @@ def render_dashboard_tab(collection, neo4j_uri=None, neo4j_user=None, neo4j_pass
     client, alive = _try_connect(uri=neo4j_uri, user=neo4j_user, password=neo4j_password)
     if alive:
         try:
-            graph_stats = client.graph_stats()
+            graph_stats = _cached_graph_stats(uri=neo4j_uri, user=neo4j_user, password=neo4j_password)
         except Exception:
             pass
 
@@ -142,10 +149,10 @@ def render_dashboard_tab(collection, neo4j_uri=None, neo4j_user=None, neo4j_pass
     # Calculate active sources considering both Chroma and Neo4j
     active_srcs = 0
     for src in SOURCES:
-        has_chroma = chroma_counts.get(src["chroma_source"], 0) > 0
+        has_chroma = chroma_counts.get(src.chroma_source, 0) > 0
         has_graph  = False
-        if "graph_label" in src and graph_stats:
-            has_graph = graph_stats.get(src["graph_label"], 0) > 0
+        if src.graph_label and graph_stats:
+            has_graph = graph_stats.get(src.graph_label, 0) > 0
         
         if has_chroma or has_graph:
             active_srcs += 1
@@ -177,30 +184,30 @@ def render_dashboard_tab(collection, neo4j_uri=None, neo4j_user=None, neo4j_pass
     cols = st.columns(len(SOURCES))
 
     for col, src in zip(cols, SOURCES):
-        cs       = src["chroma_source"]
+        cs       = src.chroma_source
         ingested = chroma_counts.get(cs, 0)
         
         # If Chroma is empty, check Neo4j if applicable
         graph_count = 0
-        if ingested == 0 and "graph_label" in src:
-            graph_count = graph_stats.get(src["graph_label"], 0)
+        if ingested == 0 and src.graph_label:
+            graph_count = graph_stats.get(src.graph_label, 0)
 
-        scan     = data_scan[src["id"]]
+        scan     = data_scan[src.id]
         files    = scan["files"]
         size_mb  = scan["size_mb"]
 
         if ingested > 0:
             status_icon, status_label, status_color = "done", f"{ingested:,} chunks", "#22c55e"
             display_count = ingested
-            display_label = f"Ingested {src['stat_label']}"
+            display_label = f"Ingested {src.stat_label}"
         elif graph_count > 0:
             status_icon, status_label, status_color = "hub", f"{graph_count:,} nodes", "#6366f1"
             display_count = graph_count
-            display_label = f"Graph {src['graph_label']}s"
+            display_label = f"Graph {src.graph_label}s"
         elif files:
             status_icon, status_label, status_color = "folder_open", f"{len(files)} file(s) ready", "#f59e0b"
             display_count = 0
-            display_label = f"Pending {src['stat_label']}"
+            display_label = f"Pending {src.stat_label}"
         else:
             status_icon, status_label, status_color = "○", "No data found", "#64748b"
             display_count = 0
@@ -210,17 +217,17 @@ def render_dashboard_tab(collection, neo4j_uri=None, neo4j_user=None, neo4j_pass
             st.markdown(
                 f"""
                 <div style="
-                    background: linear-gradient(135deg, {src['color']}18, {src['color']}08);
-                    border: 1px solid {src['color']}40;
-                    border-left: 4px solid {src['color']};
+                    background: linear-gradient(135deg, {src.color}18, {src.color}08);
+                    border: 1px solid {src.color}40;
+                    border-left: 4px solid {src.color};
                     border-radius: 12px;
                     padding: 20px 16px;
                     margin-bottom: 12px;
                 ">
-                    <div style="margin-bottom:6px"><span class="material-symbols-outlined" style="font-size:2rem;color:{src['color']}">{src['icon']}</span></div>
-                    <div style="font-weight:700;font-size:1rem;color:#f1f5f9;margin-bottom:4px">{src['label']}</div>
-                    <div style="font-size:0.78rem;color:#94a3b8;margin-bottom:12px">{src['description']}</div>
-                    <div style="font-size:1.6rem;font-weight:800;color:{src['color']};letter-spacing:-0.5px">
+                    <div style="margin-bottom:6px"><span class="material-symbols-outlined" style="font-size:2rem;color:{src.color}">{src.icon}</span></div>
+                    <div style="font-weight:700;font-size:1rem;color:#f1f5f9;margin-bottom:4px">{src.label}</div>
+                    <div style="font-size:0.78rem;color:#94a3b8;margin-bottom:12px">{src.description}</div>
+                    <div style="font-size:1.6rem;font-weight:800;color:{src.color};letter-spacing:-0.5px">
                         {display_count:,}
                     </div>
                     <div style="font-size:0.72rem;color:#64748b;margin-bottom:10px">{display_label}</div>
@@ -414,16 +421,16 @@ def render_dashboard_tab(collection, neo4j_uri=None, neo4j_user=None, neo4j_pass
     st.markdown("#### :material/folder: `data/` folder status")
     rows = []
     for src in SOURCES:
-        scan  = data_scan[src["id"]]
+        scan  = data_scan[src.id]
         flist = ", ".join(f.name for f in scan["files"][:3])
         if len(scan["files"]) > 3:
             flist += f" (+{len(scan['files'])-3} more)"
         rows.append({
-            "Source":    f"{src['icon']} {src['label']}",
-            "Folder":    f"data/{src['data_folder']}/",
+            "Source":    f"{src.icon} {src.label}",
+            "Folder":    f"data/{src.data_folder}/",
             "Files":     flist or "—",
             "Size (MB)": f"{scan['size_mb']:.1f}" if scan["files"] else "—",
-            "Status":    "Ingested" if chroma_counts.get(src["chroma_source"], 0) > 0
+            "Status":    "Ingested" if chroma_counts.get(src.chroma_source, 0) > 0
                          else ("Ready" if scan["files"] else "Not found"),
         })
     st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
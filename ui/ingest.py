@@ -14,14 +14,20 @@ import sys
 import threading
 from pathlib import Path
 
+import numpy as np
 import streamlit as st
 
-from config import CHROMA_PATH, SOURCES
+from config import CHROMA_PATH, DEFAULT_INGEST_BATCH, SOURCES
 from ui.components.log_viewer import scrollable_log
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+# Conversation-length histogram: bucket i holds counts in (edge[i-1], edge[i]],
+# the last bucket everything above the final edge.
+_LENGTH_BUCKET_EDGES = np.array([10, 50, 100, 500, 1000, 5000, 10000])
+_LENGTH_BUCKET_LABELS = ["1-10", "11-50", "51-100", "101-500", "501-1k", "1k-5k", "5k-10k", "10k+"]
+
 
 
 # ── Main render function ─────────────────────────────────────────────────────
@@ -79,12 +85,12 @@ def render_vector_tab(collection, episodic=None):
     # Display per-source stat buttons (matching Graph page entity buttons)
     src_cols = st.columns(max(len(SOURCES), 1))
     for col, src_cfg in zip(src_cols, SOURCES):
-        count = source_counts.get(src_cfg["chroma_source"], 0)
+        count = source_counts.get(src_cfg.chroma_source, 0)
         with col:
             st.button(
-                f"{src_cfg['label']}  {count:,}",
-                key=f"vec_stat_{src_cfg['id']}",
-                help=f"{src_cfg['description']}",
+                f"{src_cfg.label}  {count:,}",
+                key=f"vec_stat_{src_cfg.id}",
+                help=f"{src_cfg.description}",
                 width="stretch",
                 type="secondary",
             )
@@ -95,12 +101,12 @@ def render_vector_tab(collection, episodic=None):
         f'background:#1e293b;border:1px solid #334155;'
         f'border-radius:20px;padding:4px 12px;margin:3px 4px;font-size:0.78rem;'
         f'color:#cbd5e1;white-space:nowrap;">'
-        f'<span class="material-symbols-outlined" style="font-size:16px;color:{src["color"]}">'
-        f'{src["icon"]}</span>'
-        f' <b style="color:#e2e8f0">{src["label"]}</b>'
-        f' <span style="color:{src["color"]};font-weight:700">'
-        f'{source_counts.get(src["chroma_source"], 0):,}</span>'
-        f' {src["stat_label"]}'
+        f'<span class="material-symbols-outlined" style="font-size:16px;color:{src.color}">'
+        f'{src.icon}</span>'
+        f' <b style="color:#e2e8f0">{src.label}</b>'
+        f' <span style="color:{src.color};font-weight:700">'
+        f'{source_counts.get(src.chroma_source, 0):,}</span>'
+        f' {src.stat_label}'
         f'</span>'
         for src in SOURCES
     )
@@ -216,30 +222,13 @@ def _render_ingestor_section(collection, current_count: int):
         conv_stats = _load_conversation_stats(json_default_path)
         
         if conv_stats:
-            # Group into logarithmic-style buckets
-            buckets = {
-                "1-10": 0,
-                "11-50": 0,
-                "51-100": 0,
-                "101-500": 0,
-                "501-1k": 0,
-                "1k-5k": 0,
-                "5k-10k": 0,
-                "10k+": 0
-            }
-            for count in conv_stats.values():
-                if count <= 10: buckets["1-10"] += 1
-                elif count <= 50: buckets["11-50"] += 1
-                elif count <= 100: buckets["51-100"] += 1
-                elif count <= 500: buckets["101-500"] += 1
-                elif count <= 1000: buckets["501-1k"] += 1
-                elif count <= 5000: buckets["1k-5k"] += 1
-                elif count <= 10000: buckets["5k-10k"] += 1
-                else: buckets["10k+"] += 1
+            # Group into logarithmic-style buckets: one sorted lookup per
+            # conversation, then a single bincount over the bucket indices
+            counts = np.fromiter(conv_stats.values(), dtype=np.int64, count=len(conv_stats))
+            bucket_idx = np.searchsorted(_LENGTH_BUCKET_EDGES, counts, side="left")
             
-            # Remove empty trailing buckets for a cleaner chart (but keep the shape continuous)
-            x_vals = list(buckets.keys())
-            y_vals = list(buckets.values())
+            x_vals = _LENGTH_BUCKET_LABELS
+            y_vals = np.bincount(bucket_idx, minlength=len(_LENGTH_BUCKET_LABELS)).tolist()
             
             fig = go.Figure(data=[
                 go.Bar(
@@ -274,7 +263,8 @@ def _render_ingestor_section(collection, current_count: int):
             )
             batch_size = st.number_input(
                 "Batch size", min_value=4, max_value=5000,
-                value=32, step=4, key="batch_size",
+                value=DEFAULT_INGEST_BATCH, step=50, key="batch_size",
+                help="Documents written to ChromaDB per upsert call",
             )
         with col_b:
             session_gap_h = st.slider(
@@ -339,8 +329,8 @@ def _render_ingestor_section(collection, current_count: int):
                     if proc.returncode == 0:
                         if reset_col:
                             # Clear Streamlit caches so they don't hold the old deleted collection UUID
-                            from rag.resources import load_chroma, load_bm25_corpus
-                            load_chroma.clear()
+                            from rag.resources import reset_chroma, load_bm25_corpus
+                            reset_chroma()
                             load_bm25_corpus.clear()
                             
                             import chromadb
@@ -272,9 +272,9 @@ def _settings_dialog():
             st.error(f"Failed to save settings to disk: {e}")
 
         if _emb_changed:
-            from rag.resources import load_embedding_func, load_chroma
+            from rag.resources import load_embedding_func, reset_chroma
             load_embedding_func.clear()
-            load_chroma.clear()
+            reset_chroma()
             st.toast("Embedding model changed. Cached resources cleared.", icon="⚠️")
         else:
             st.toast("Settings saved.", icon="✅")
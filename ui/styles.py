@@ -0,0 +1,96 @@
+"""
+ui/styles.py — Global CSS injected once per script run by app.py.
+"""
+import re
+
+import streamlit as st
+
+_CSS = """
+<link href="https://fonts.googleapis.com/css2?family=Material+Symbols+Outlined" rel="stylesheet" />
+<style>
+    /* Base */
+    html, body, [class*="css"] { font-family: 'Inter', sans-serif; }
+    .main { background-color: #0f1117; }
+
+    /* Sidebar */
+    [data-testid="stSidebar"] {
+        background: linear-gradient(180deg, #1a1d2e 0%, #12141f 100%);
+        border-right: 1px solid #2d2f45;
+    }
+
+    /* Status badges */
+    .status-ok   { color: #4ade80; font-weight: 600; }
+    .status-warn { color: #facc15; font-weight: 600; }
+    .status-err  { color: #f87171; font-weight: 600; }
+
+    /* Chat messages */
+    [data-testid="stChatMessage"] {
+        border-radius: 12px;
+        margin-bottom: 8px;
+    }
+    
+    /* Align USERS to the right, ASSISTANTS to the left */
+    /* stChatMessage: the outer message container */
+    [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatarUser"]) {
+        flex-direction: row-reverse;
+    }
+    /* stChatMessageContent: the inner wrapper for the content */
+    [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatarUser"]) [data-testid="stChatMessageContent"] {
+        display: flex;
+        flex-direction: column;
+        align-items: flex-end;
+        width: 100%;
+    }
+    /* Target the markdown container specifically to ensure it doesn't expand to 100% */
+    [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatarUser"]) [data-testid="stMarkdownContainer"] {
+        width: fit-content !important;
+        text-align: right;
+    }
+    [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatarUser"]) [data-testid="stMarkdownContainer"] p {
+        text-align: right;
+    }
+
+    /* RAG card */
+    .rag-card {
+        background: #1e2030;
+        border: 1px solid #2d3250;
+        border-radius: 10px;
+        padding: 14px 18px;
+        margin-bottom: 10px;
+        font-size: 0.88rem;
+        line-height: 1.6;
+    }
+    .rag-card-header {
+        font-size: 0.75rem;
+        color: #8b9cb6;
+        margin-bottom: 6px;
+        display: flex;
+        gap: 12px;
+    }
+    .rag-card-header span { font-weight: 600; color: #a5b4fc; }
+
+    /* Thinking block */
+    .think-block {
+        background: #181b2e;
+        border-left: 3px solid #6366f1;
+        padding: 10px 14px;
+        border-radius: 0 8px 8px 0;
+        font-size: 0.82rem;
+        color: #94a3b8;
+        white-space: pre-wrap;
+    }
+
+    /* token bar label */
+    .token-label { font-size: 0.78rem; color: #64748b; }
+</style>
+"""
+
+# Collapse whitespace at import time so fewer bytes go over the websocket on
+# every rerun.
+_CSS_MIN = re.sub(r"\s+", " ", _CSS).strip()
+
+
+@st.cache_resource
+def get_css() -> str:
+    """Return the prebuilt, minified global stylesheet."""
+    return _CSS_MIN